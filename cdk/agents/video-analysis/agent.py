@@ -28,17 +28,34 @@ VIDEO_BUCKET = os.environ.get('VIDEO_BUCKET')
 VIDEO_ANALYSIS_MODEL_ID = os.environ.get('VIDEO_ANALYSIS_MODEL_ID', 'global.amazon.nova-2-lite-v1:0')
 AWS_REGION = os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'us-west-2'))
 
+# 動画分析の推論設定（固定値のため初期化時に一度だけ定義）
+VIDEO_ANALYSIS_INFERENCE_CONFIG = {"maxTokens": 4096, "temperature": 0.3}
+
+# Bedrockクライアント（起動時に一度だけ作成し、呼び出し間で再利用）
+bedrock_runtime = boto3.client(
+    'bedrock-runtime',
+    region_name=AWS_REGION,
+    config=Config(retries={'max_attempts': 3}, tcp_keepalive=True)
+)
+
 app = FastAPI(title="Video Analysis Agent", version="1.0.0")
 
+# JSON部分の解析用（開始位置から1回の走査でオブジェクトを読み取る）
+json_decoder = json.JSONDecoder()
+
+
+def get_video_format(video_key: str) -> str:
+    """動画キーの拡張子（大文字小文字を区別しない）からConverse APIのformatを決定（検索対象はmp4/webmのみ）"""
+    return "webm" if video_key.lower().endswith(".webm") else "mp4"
+
 
 def parse_json_response(response_text: str) -> Dict[str, Any]:
-    """JSONレスポンスをパース"""
+    """JSONレスポンスをパース（最初のJSONオブジェクトを取り出し、後続のテキストは無視する）"""
     json_start = response_text.find("{")
-    json_end = response_text.rfind("}") + 1
-    if json_start >= 0 and json_end > json_start:
-        json_str = response_text[json_start:json_end]
-        return json.loads(json_str)
-    raise ValueError("JSONが見つかりません")
+    if json_start < 0:
+        raise ValueError("JSONが見つかりません")
+    result, _ = json_decoder.raw_decode(response_text, json_start)
+    return result
 
 
 def analyze_video(video_key: str, language: str) -> Optional[Dict[str, Any]]:
@@ -50,12 +67,6 @@ def analyze_video(video_key: str, language: str) -> Optional[Dict[str, Any]]:
         prompt = get_video_analysis_prompt(language)
         
         # 動画分析はconverse APIを直接使用（マルチモーダル対応のため）
-        bedrock_runtime = boto3.client(
-            'bedrock-runtime',
-            region_name=AWS_REGION,
-            config=Config(retries={'max_attempts': 3})
-        )
-        
         response = bedrock_runtime.converse(
             modelId=VIDEO_ANALYSIS_MODEL_ID,
             messages=[{
@@ -63,7 +74,7 @@ def analyze_video(video_key: str, language: str) -> Optional[Dict[str, Any]]:
                 "content": [
                     {
                         "video": {
-                            "format": "mp4",
+                            "format": get_video_format(video_key),
                             "source": {
                                 "s3Location": {
                                     "uri": video_uri
@@ -76,10 +87,7 @@ def analyze_video(video_key: str, language: str) -> Optional[Dict[str, Any]]:
                     }
                 ]
             }],
-            inferenceConfig={
-                "maxTokens": 4096,
-                "temperature": 0.3
-            }
+            inferenceConfig=VIDEO_ANALYSIS_INFERENCE_CONFIG
         )
         
         response_text = response["output"]["message"]["content"][0]["text"]
@@ -5,10 +5,8 @@
 from typing import Dict, Any
 
 
-def get_video_analysis_prompt(language: str) -> str:
-    """動画分析用プロンプトを取得"""
-    if language == 'en':
-        return """Analyze this sales roleplay video recording and evaluate the salesperson's performance.
+# 動画分析用プロンプト（固定文言のため初期化時に一度だけ定義）
+VIDEO_ANALYSIS_PROMPT_EN = """Analyze this sales roleplay video recording and evaluate the salesperson's performance.
 
 Focus on:
 1. Eye contact and gaze direction
@@ -30,8 +28,8 @@ Provide your analysis in the following JSON format only (scores are 1-10):
 }
 
 Respond ONLY with the JSON object."""
-    else:
-        return """この営業ロールプレイの録画動画を分析し、営業担当者のパフォーマンスを評価してください。
+
+VIDEO_ANALYSIS_PROMPT_JA = """この営業ロールプレイの録画動画を分析し、営業担当者のパフォーマンスを評価してください。
 
 以下の点に注目してください：
 1. アイコンタクトと視線の方向
@@ -55,6 +53,18 @@ Respond ONLY with the JSON object."""
 JSONオブジェクトのみを返してください。"""
 
 
+# 言語ごとの動画分析用プロンプト
+VIDEO_ANALYSIS_PROMPTS = {
+    'en': VIDEO_ANALYSIS_PROMPT_EN,
+    'ja': VIDEO_ANALYSIS_PROMPT_JA,
+}
+
+
+def get_video_analysis_prompt(language: str) -> str:
+    """動画分析用プロンプトを取得（未対応の言語は日本語）"""
+    return VIDEO_ANALYSIS_PROMPTS.get(language, VIDEO_ANALYSIS_PROMPT_JA)
+
+
 def create_default_video_analysis(language: str) -> Dict[str, Any]:
     """デフォルトの動画分析結果を作成"""
     if language == 'en':
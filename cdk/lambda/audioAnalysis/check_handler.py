@@ -10,7 +10,7 @@ import os
 import boto3
 import boto3.dynamodb.conditions
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -81,7 +81,7 @@ def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, A
             output = {
                 **event,
                 "jobStatus": job_status,
-                "checkTime": datetime.utcnow().isoformat() + "Z"
+                "checkTime": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
             }
             
             # 完了時は転写結果情報を追加
@@ -215,7 +215,7 @@ def update_analysis_progress(session_id: str, step: str, additional_data: Dict[s
             # 既存レコードを更新
             existing_item = items[0]
             existing_item["currentStep"] = step
-            existing_item["updatedAt"] = datetime.utcnow().isoformat() + "Z"
+            existing_item["updatedAt"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
             
             if additional_data:
                 existing_item.update(additional_data)
@@ -11,7 +11,7 @@ import boto3
 import boto3.dynamodb.conditions
 import urllib.request
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.logging import correlation_paths
@@ -171,7 +171,7 @@ def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, A
         output = {
             **event,  # 前ステップの出力を継承
             "audioAnalysisResult": analysis_result.model_dump(),
-            "analysisCompletedTime": datetime.utcnow().isoformat() + "Z"
+            "analysisCompletedTime": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         }
         
         logger.info("AI分析処理完了", extra={
@@ -227,7 +227,7 @@ def update_analysis_progress(session_id: str, step: str, additional_data: Dict[s
             # 既存レコードを更新
             existing_item = items[0]
             existing_item["currentStep"] = step
-            existing_item["updatedAt"] = datetime.utcnow().isoformat() + "Z"
+            existing_item["updatedAt"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
             
             if additional_data:
                 existing_item.update(additional_data)
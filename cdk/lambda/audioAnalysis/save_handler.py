@@ -10,7 +10,7 @@ import boto3
 import boto3.dynamodb.conditions
 import time
 from typing import Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 
 from aws_lambda_powertools import Logger
@@ -133,7 +133,7 @@ def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, A
             "sessionId": session_id,
             "resultsSaved": True,
             "feedbackGenerated": True,
-            "completedTime": datetime.utcnow().isoformat() + "Z"
+            "completedTime": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         }
         
         logger.info("結果保存処理完了", extra={
@@ -200,7 +200,7 @@ def save_analysis_result(session_id: str, user_id: str, scenario_id: str, langua
 
     # TTL設定（180日後に削除）
     expire_at = int(time.time()) + (180 * 24 * 60 * 60)
-    current_time = datetime.utcnow().isoformat() + "Z"
+    current_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
     try:
         # Float型をDecimal型に変換（DynamoDB要求）
@@ -238,7 +238,7 @@ def build_messages_from_audio_analysis(audio_analysis_result: Dict[str, Any], se
     """
     messages = []
     segments = audio_analysis_result.get("segments", [])
-    created_at = datetime.utcnow().isoformat() + "Z"  # ISO形式の文字列
+    created_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")  # ISO形式の文字列
     
     for i, segment in enumerate(segments):
         sender = "user" if segment.get("role") == "customer" else "npc"
@@ -389,7 +389,7 @@ def save_feedback_to_dynamodb(
             raise ValueError("SESSION_FEEDBACK_TABLE環境変数が設定されていません")
             
         feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
-        current_time = datetime.utcnow().isoformat() + "Z"
+        current_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         expire_at = int(time.time()) + (180 * 24 * 60 * 60)  # 180日後
         
         # ゴール結果を作成
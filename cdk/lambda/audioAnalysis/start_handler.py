@@ -9,7 +9,7 @@ import os
 import boto3
 import time
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -113,7 +113,7 @@ def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, A
             "userId": user_id,
             "transcribeJobName": transcribe_job_name,
             "validated": True,
-            "startTime": datetime.utcnow().isoformat() + "Z"
+            "startTime": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         }
         
         logger.info("音声分析開始処理完了", extra={
@@ -147,7 +147,7 @@ def set_analysis_start_flag(session_id: str, user_id: str, scenario_id: str, lan
     """
     try:
         feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
-        current_time = datetime.utcnow().isoformat() + "Z"
+        current_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         
         # TTL設定（3時間後に削除）
         expire_at = int(time.time()) + (3 * 60 * 60)
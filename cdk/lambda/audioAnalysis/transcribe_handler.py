@@ -9,7 +9,7 @@ import os
 import boto3
 import boto3.dynamodb.conditions
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -117,7 +117,7 @@ def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, A
             **event,  # 前ステップの出力を継承
             "jobStatus": "IN_PROGRESS",
             "outputLocation": f"s3://{AUDIO_STORAGE_BUCKET}/{output_key}",
-            "transcribeStartTime": datetime.utcnow().isoformat() + "Z"
+            "transcribeStartTime": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         }
         
         logger.info("Transcribe開始処理完了", extra={
@@ -181,7 +181,7 @@ def update_analysis_progress(session_id: str, step: str, additional_data: Dict[s
             existing_item = items[0]
             existing_item["currentStep"] = step
             existing_item["status"] = "IN_PROGRESS"
-            existing_item["updatedAt"] = datetime.utcnow().isoformat() + "Z"
+            existing_item["updatedAt"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
             
             if additional_data:
                 existing_item.update(additional_data)
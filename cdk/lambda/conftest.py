@@ -0,0 +1,43 @@
+"""
+Lambda関数のテストで共通のフィクスチャ
+
+各Lambdaのtestsディレクトリから使用する（pytest.iniによりこのディレクトリがrootdirとなる）。
+"""
+import pytest
+
+
+class FakeEventStream:
+    """Bedrockのconverse_streamのイベントストリームを模したクラス"""
+
+    def __init__(self, events):
+        self._events = events
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for event in self._events:
+            self.consumed += 1
+            yield event
+
+    def close(self):
+        self.closed = True
+
+
+class BrokenEventStream(FakeEventStream):
+    """指定したイベントを返した後に例外を送出するイベントストリーム"""
+
+    def __iter__(self):
+        yield from super().__iter__()
+        raise RuntimeError("stream error")
+
+
+@pytest.fixture
+def event_stream():
+    """イベントのリストからFakeEventStreamを作成するファクトリ"""
+    return FakeEventStream
+
+
+@pytest.fixture
+def broken_event_stream():
+    """イベントのリストからBrokenEventStreamを作成するファクトリ"""
+    return BrokenEventStream
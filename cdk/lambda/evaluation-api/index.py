@@ -7,6 +7,8 @@ AgentCore MemoryとS3から評価データを取得するAPIエンドポイン
 import json
 import os
 import logging
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -23,8 +25,39 @@ FEEDBACK_BUCKET = os.environ.get('FEEDBACK_BUCKET')
 VIDEO_BUCKET = os.environ.get('VIDEO_BUCKET')
 REGION = os.environ.get('AWS_REGION', 'us-west-2')
 
-# AWSクライアント
-s3_client = boto3.client('s3')
+# AWSクライアント（ウォームインスタンスで接続を再利用するためkeep-aliveを有効化）
+BOTO_CONFIG = Config(max_pool_connections=50, tcp_keepalive=True)
+s3_client = boto3.client('s3', config=BOTO_CONFIG)
+agentcore_client = boto3.client('bedrock-agent-runtime', region_name=REGION, config=BOTO_CONFIG)
+
+# 動画分析結果のキャッシュ（session_id -> (取得時刻, 分析結果)）
+# 分析結果は一度保存されると変更されないため、ウォームなインスタンスで再利用する
+VIDEO_ANALYSIS_CACHE_TTL_SECONDS = 300
+VIDEO_ANALYSIS_CACHE_MAX_SIZE = 512
+video_analysis_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def get_cached_video_analysis(session_id: str) -> Optional[Dict[str, Any]]:
+    """キャッシュから動画分析結果を取得（期限切れの場合はNone）"""
+    cached = video_analysis_cache.get(session_id)
+    if cached is None:
+        return None
+    
+    cached_at, video_analysis = cached
+    if time.time() - cached_at >= VIDEO_ANALYSIS_CACHE_TTL_SECONDS:
+        del video_analysis_cache[session_id]
+        return None
+    
+    video_analysis_cache.move_to_end(session_id)
+    return video_analysis
+
+
+def cache_video_analysis(session_id: str, video_analysis: Dict[str, Any]) -> None:
+    """動画分析結果をキャッシュに保存（上限を超えた場合は最も古いものを削除）"""
+    video_analysis_cache[session_id] = (time.time(), video_analysis)
+    video_analysis_cache.move_to_end(session_id)
+    while len(video_analysis_cache) > VIDEO_ANALYSIS_CACHE_MAX_SIZE:
+        video_analysis_cache.popitem(last=False)
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -84,8 +117,6 @@ def get_conversation_history(session_id: str, query_params: Dict[str, str]) -> D
         
         # AgentCore Memory APIを呼び出し
         # 注: 実際のAgentCore Memory APIクライアントに置き換える
-        agentcore_client = boto3.client('bedrock-agent-runtime', region_name=REGION)
-        
         try:
             # AgentCore Memory ListEvents呼び出し
             response = agentcore_client.list_memory_events(
@@ -156,8 +187,6 @@ def get_metrics_history(session_id: str, query_params: Dict[str, str]) -> Dict[s
     try:
         logger.info(f"メトリクス履歴取得: session_id={session_id}")
         
-        agentcore_client = boto3.client('bedrock-agent-runtime', region_name=REGION)
-        
         try:
             response = agentcore_client.list_memory_events(
                 memoryId=AGENTCORE_RUNTIME_ARN,
@@ -271,12 +300,15 @@ def get_video_analysis(session_id: str) -> Dict[str, Any]:
     try:
         logger.info(f"動画分析結果取得: session_id={session_id}")
         
-        # S3から動画分析結果を取得
+        # S3から動画分析結果を取得（キャッシュにあればそれを使用）
         key = f"sessions/{session_id}/video-analysis.json"
         
         try:
-            response = s3_client.get_object(Bucket=FEEDBACK_BUCKET, Key=key)
-            video_analysis = json.loads(response['Body'].read().decode('utf-8'))
+            video_analysis = get_cached_video_analysis(session_id)
+            if video_analysis is None:
+                response = s3_client.get_object(Bucket=FEEDBACK_BUCKET, Key=key)
+                video_analysis = json.loads(response['Body'].read().decode('utf-8'))
+                cache_video_analysis(session_id, video_analysis)
             
             # 動画URLを生成（署名付きURL）
             video_key = f"recordings/{session_id}.mp4"
@@ -23,7 +23,7 @@ from botocore.config import Config
 import uuid
 import time
 import urllib.parse
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.event_handler import APIGatewayRestResolver, CORSConfig
@@ -444,7 +444,7 @@ def start_knowledge_base_ingestion():
                     ingestion_response = bedrock_agent_client.start_ingestion_job(
                         knowledgeBaseId=KNOWLEDGE_BASE_ID,
                         dataSourceId=data_source_id,
-                        description=f"シナリオ更新によるingestion job - {datetime.utcnow().isoformat()}"
+                        description=f"シナリオ更新によるingestion job - {datetime.now(timezone.utc).isoformat()}"
                     )
                     
                     ingestion_job = ingestion_response.get('ingestionJob', {})
@@ -979,7 +979,7 @@ def create_scenario():
             logger.info(f"自動生成されたシナリオIDを使用: {scenario_id}")
         
         # 現在のタイムスタンプ（ISO 8601形式）
-        current_time = datetime.utcnow().isoformat() + 'Z'
+        current_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
         
         # 保存するシナリオデータの構築
         scenario_data = {
@@ -1136,7 +1136,7 @@ def update_scenario(scenario_id: str):
             check_scenario_access(existing_scenario, user_id, "edit", request_fields)
             
             # 現在のタイムスタンプ
-            current_time = datetime.utcnow().isoformat() + 'Z'
+            current_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
             
             # 更新用のシナリオデータを構築
             set_expressions = ["updatedAt = :updatedAt"]
@@ -1516,7 +1516,7 @@ def export_single_scenario(scenario_id: str):
             export_data = {
                 'scenarios': [scenario_data],
                 'npcs': npcs,
-                'exportedAt': datetime.utcnow().isoformat() + 'Z',
+                'exportedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
                 'exportedBy': user_id,
                 'version': '1.0'
             }
@@ -1584,7 +1584,7 @@ def import_scenarios():
             skipped_scenarios = []
             errors = []
             
-            current_time = datetime.utcnow().isoformat() + 'Z'
+            current_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
             
             for scenario_data in scenarios_to_import:
                 try:
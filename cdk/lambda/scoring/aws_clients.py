@@ -0,0 +1,46 @@
+"""
+AWSクライアント共通設定モジュール
+
+スコアリングLambda内の各モジュールで共有するboto3クライアント/リソースを
+1つのHTTP接続プール設定で初期化します。Lambdaの初期化フェーズで接続を
+確立しておくことで、最初のリクエストでのTLSハンドシェイク待ちを避けます。
+"""
+
+import boto3
+from botocore.config import Config
+from aws_lambda_powertools import Logger
+
+logger = Logger(service="scoring-api")
+
+# 共通のクライアント設定（接続プールの拡張、アダプティブリトライ、TCPキープアライブ）
+# 最大試行回数は環境変数 AWS_MAX_ATTEMPTS の設定に従う
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive"},
+    tcp_keepalive=True
+)
+
+# Bedrockクライアント初期化
+bedrock_runtime = boto3.client('bedrock-runtime', config=BOTO_CONFIG)
+
+# DynamoDBリソース初期化
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+
+# Lambdaクライアント初期化（会話履歴の要約を自身の非同期呼び出しで生成するため）
+lambda_client = boto3.client('lambda', config=BOTO_CONFIG)
+
+
+def prewarm_connections() -> None:
+    """
+    DynamoDBへの接続を事前に確立する
+    
+    初期化フェーズで軽量なAPIを呼び出してDNS解決とTLSハンドシェイクを済ませます。
+    失敗してもリクエスト処理には影響しないため、警告ログのみ出力します。
+    """
+    try:
+        dynamodb.meta.client.describe_endpoints()
+    except Exception as e:
+        logger.warning(f"DynamoDB接続の事前確立に失敗しました: {str(e)}")
+
+
+prewarm_connections()
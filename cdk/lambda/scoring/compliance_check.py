@@ -13,7 +13,6 @@ Functions:
 
 import json
 import os
-import boto3
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
@@ -24,8 +23,8 @@ from aws_lambda_powertools.utilities import parameters
 # Powertools 初期化
 logger = Logger(service="compliance-check-service")
 
-# Bedrockクライアント初期化
-bedrock_runtime = boto3.client('bedrock-runtime')
+# 共通設定のBedrockクライアント/DynamoDBリソースを使用
+from aws_clients import bedrock_runtime, dynamodb
 
 def check_compliance_violations(
     user_messages: List[str],
@@ -219,9 +218,6 @@ def load_scenario_guardrail(scenario_id: Optional[str] = None, language: Optiona
             # DynamoDBからシナリオデータを取得
             guardrail_id = default_guardrail_id  # デフォルト値を設定
             try:
-                # DynamoDBクライアントの初期化
-                dynamodb = boto3.resource('dynamodb')
-                
                 # 環境変数からテーブル名を取得
                 scenarios_table_name = os.environ.get('SCENARIOS_TABLE_NAME')
                 logger.debug(f"DynamoDB テーブル名: {scenarios_table_name}")
@@ -0,0 +1,78 @@
+"""
+ヒューリスティックスコアラーモジュール
+
+あいさつや「なるほど」などの相づちのみの発言など、メトリクスを動かさないことが
+明らかな発言をローカルの簡易判定で検出します。該当する発言ではBedrockを呼び出さず、
+DynamoDBに保存済みの直前のスコアをそのまま返せるようにします。
+「はい」「yes」などの同意の発言は価格や次のステップへの合意となり得るため対象外です。
+
+Functions:
+    is_neutral_turn: 発言がスコアに影響しない（変化量0と判断できる）かを判定
+    select_prior_scores: 保存済みの直前のスコアのアイテムから使用するスコアを選択
+"""
+
+import re
+from typing import Dict, Any, Optional
+
+# スコアに影響しないと判断する発言の最大文字数
+MAX_NEUTRAL_LENGTH = 20
+
+# あいさつ・相づちのみの発言（同意や承諾を表す発言は含めない）
+NEUTRAL_PATTERN = re.compile(
+    r"^(?:こんにちは|こんばんは|おはようございます|失礼します|なるほど|"
+    r"hi|hello|good (?:morning|afternoon|evening)|i see)"
+    r"[\s。、，,.!！?？ー〜~]*$",
+    re.IGNORECASE
+)
+
+# 怒り・好意・商談の進展に関わる語（含まれる場合はモデルで評価する）
+SENTIMENT_PATTERN = re.compile(
+    r"価格|値段|値引|割引|見積|契約|導入|予算|比較|競合|無理|困|遅い|高い|不満|申し訳|すみません|"
+    r"price|discount|quote|contract|budget|competitor|sorry|problem|expensive|angry|delay",
+    re.IGNORECASE
+)
+
+# 直前のスコアとして使用する3つの基本メトリクス
+PRIOR_SCORE_KEYS = ("angerLevel", "trustLevel", "progressLevel")
+
+
+def is_neutral_turn(user_input: str) -> bool:
+    """
+    発言がスコアに影響しないかを判定
+    
+    短いあいさつ・相づちのみで構成され、感情や商談に関わる語を含まない
+    発言のみを対象とします。判定に自信がない場合はFalseを返します。
+    
+    Args:
+        user_input (str): ユーザーの最新の発言
+        
+    Returns:
+        bool: スコアの変化量が0と判断できる場合はTrue
+    """
+    text = user_input.strip()
+    if not text or len(text) > MAX_NEUTRAL_LENGTH:
+        return False
+    
+    return bool(NEUTRAL_PATTERN.match(text)) and not SENTIMENT_PATTERN.search(text)
+
+
+def select_prior_scores(prior_item: Optional[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """
+    保存済みの直前のスコアのアイテムから、Bedrock呼び出しを省略する際に使用するスコアを選択
+    
+    モデルによる評価結果の場合のみ返します。デフォルト値で保存されたアイテム（defaultScores）や
+    メトリクスが欠けているアイテムは直前のスコアとして信頼できないため、Noneを返します。
+    
+    Args:
+        prior_item (Optional[Dict[str, Any]]): セッションの直前のスコアのアイテム
+        
+    Returns:
+        Optional[Dict[str, int]]: 3つの基本メトリクス（使用できない場合はNone）
+    """
+    if not prior_item:
+        return None
+    
+    if prior_item.get("defaultScores") or any(prior_item.get(key) is None for key in PRIOR_SCORE_KEYS):
+        return None
+    
+    return {key: int(prior_item[key]) for key in PRIOR_SCORE_KEYS}
@@ -1,15 +1,27 @@
 import json
+import os
 import boto3
 import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.event_handler import APIGatewayRestResolver, CORSConfig
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError, InternalServerError
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+# 共通のAWSクライアント（初期化時に接続を確立）
+from aws_clients import dynamodb
+
 # リアルタイムスコアリングモジュールをインポート
-from realtime_scoring import calculate_realtime_scores
+from realtime_scoring import (
+    calculate_realtime_scores,
+    request_history_summary_refresh,
+    refresh_history_summary,
+    save_prior_scores,
+    HISTORY_SUMMARY_EVENT_KEY
+)
 # コンプライアンスチェックモジュールをインポート
 from compliance_check import check_compliance_violations
 
@@ -27,8 +39,11 @@ cors_config = CORSConfig(
 # API Gateway REST Resolver
 app = APIGatewayRestResolver(cors=cors_config)
 
-# Bedrockクライアント初期化
-bedrock_runtime = boto3.client('bedrock-runtime')
+# セッションフィードバックテーブル（共通設定のDynamoDBリソースを再利用）
+feedback_table = dynamodb.Table(os.environ.get('SESSION_FEEDBACK_TABLE', ''))
+
+# スコアリングとコンプライアンスチェック・会話履歴の要約の生成の依頼を並行実行するためのスレッドプール
+executor = ThreadPoolExecutor(max_workers=2)
 
 @app.post("/scoring/realtime")
 def handle_realtime_scoring():
@@ -78,28 +93,41 @@ def handle_realtime_scoring():
         
         # バリデーション
         if not user_message:
-            from aws_lambda_powertools.event_handler.exceptions import BadRequestError
             raise BadRequestError("ユーザーメッセージは必須です")
         
         if not session_id:
-            from aws_lambda_powertools.event_handler.exceptions import BadRequestError
             raise BadRequestError("セッションIDは必須です")
         
         # 言語設定を取得（デフォルトはja）
         language = request_body.get('language', 'ja')
         
+        # コンプライアンスチェックが有効な場合はスコアリングと並行して実行
+        # （どちらもBedrock呼び出し待ちが主なため、待ち時間を重ねて短縮する）
+        compliance_future = None
+        if compliance_check_enabled:
+            compliance_future = executor.submit(
+                run_compliance_check, user_message, session_id, scenario_id, language
+            )
+        
+        # 会話履歴の要約が古い場合は、自身の非同期呼び出しで要約の生成を依頼する
+        # （依頼のみのためすぐに完了する。今回のスコアリングには保存済みの要約を使用し、更新した要約は次の発言から使用する）
+        summary_future = executor.submit(request_history_summary_refresh, session_id, previous_messages, language)
+        
         # リアルタイムスコアリングの実行
         start_time = time.time()
         scores = calculate_realtime_scores(
             user_message, 
             previous_messages, 
-            None,  # sessionIdは不要
+            session_id,  # 会話履歴の要約キャッシュに使用
             scenario_goals,
             current_goal_statuses,
             language  # 言語パラメータを追加
         )
         processing_time = time.time() - start_time
         
+        # デフォルト値のスコアはレスポンスには含めず、保存時の目印にのみ使用する
+        is_default_scores = scores.pop("isDefault", False)
+        
         # ゴールステータスがあればレスポンスに含める
         response_data = {
             "success": True,
@@ -128,58 +156,29 @@ def handle_realtime_scoring():
             "messageCount": len(previous_messages) + 1
         }
         
+        # デフォルト値のスコアは次の発言で直前のスコアとして使用しない
+        if is_default_scores:
+            metrics_data["defaultScores"] = True
+        
         # ゴール情報も含める
         if goal_statuses_result:
             metrics_data["goalStatuses"] = goal_statuses_result
             metrics_data["goalScore"] = calculate_goal_score_from_statuses(goal_statuses_result, scenario_goals)
         
-        # コンプライアンスチェックが有効な場合は実行
+        # コンプライアンスチェックの結果を取得（スコアリングと並行して実行済み）
         compliance_result = None
-        if compliance_check_enabled:
-            try:
-                logger.info("Running compliance check", extra={
-                    "session_id": session_id,
-                    "message_length": len(user_message),
-                    "scenario_id": scenario_id
-                })
-                
-                # コンプライアンスチェック実行
-                compliance_start_time = time.time()
-                # 言語設定を取得（デフォルトはja）
-                language = request_body.get('language', 'ja')
-                compliance_result = check_compliance_violations([user_message], session_id, scenario_id, None, language)
-                compliance_processing_time = time.time() - compliance_start_time
-                
-                # コンプライアンス結果をレスポンスに追加
-                response_data["compliance"] = {
-                    "score": compliance_result["complianceScore"],
-                    "violations": compliance_result["violations"],
-                    "analysis": compliance_result["analysis"],
-                    "processingTimeMs": int(compliance_processing_time * 1000)
-                }
-                
-                logger.info("Compliance check completed", extra={
-                    "session_id": session_id,
-                    "processing_time_ms": int(compliance_processing_time * 1000),
-                    "compliance_score": compliance_result["complianceScore"],
-                    "violations_count": len(compliance_result["violations"])
-                })
-                
-            except Exception as compliance_error:
-                logger.error("Error in compliance check", extra={
-                    "error": str(compliance_error)
-                })
-                
-                # エラー時のフォールバック結果を返す
-                response_data["compliance"] = {
-                    "score": 100,  # デフォルトスコア
-                    "violations": [],
-                    "analysis": f"コンプライアンスチェック中にエラーが発生しました: {str(compliance_error)}",
-                    "error": str(compliance_error)
-                }
+        if compliance_future is not None:
+            compliance_result, response_data["compliance"] = compliance_future.result()
+        
+        # 次の発言でBedrock呼び出しを省略する際に使用する直前のスコアをメトリクスと並行して保存
+        prior_scores_future = executor.submit(save_prior_scores, session_id, metrics_data)
         
         # DynamoDBに一括保存（メトリクス + コンプライアンス結果）
         save_realtime_metrics_to_dynamodb(session_id, metrics_data, compliance_result)
+        prior_scores_future.result()
+        
+        # 要約の生成の依頼を完了させてから応答する（応答後はLambdaが停止し、スレッドも中断されるため）
+        summary_future.result()
         
         logger.info("Realtime scoring completed", extra={
             "processing_time_ms": int(processing_time * 1000),
@@ -198,9 +197,64 @@ def handle_realtime_scoring():
         logger.exception("Unexpected error in realtime scoring handler", extra={
             "error": str(error)
         })
-        from aws_lambda_powertools.event_handler.exceptions import InternalServerError
         raise InternalServerError(f"リアルタイムスコアリング中にエラーが発生しました: {str(error)}")
 
+def run_compliance_check(user_message: str, session_id: str, scenario_id: str, language: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    コンプライアンスチェックを実行し、保存用の結果とレスポンス用の結果を返す
+    
+    スコアリングと並行してスレッドプール上で実行されます。
+    
+    Args:
+        user_message: ユーザーの発言
+        session_id: セッションID
+        scenario_id: シナリオID
+        language: 言語コード
+        
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Dict[str, Any]]: (コンプライアンス結果, レスポンス用データ)
+        エラー時はコンプライアンス結果がNoneになります
+    """
+    try:
+        logger.info("Running compliance check", extra={
+            "session_id": session_id,
+            "message_length": len(user_message),
+            "scenario_id": scenario_id
+        })
+        
+        # コンプライアンスチェック実行
+        compliance_start_time = time.time()
+        compliance_result = check_compliance_violations([user_message], session_id, scenario_id, None, language)
+        compliance_processing_time = time.time() - compliance_start_time
+        
+        logger.info("Compliance check completed", extra={
+            "session_id": session_id,
+            "processing_time_ms": int(compliance_processing_time * 1000),
+            "compliance_score": compliance_result["complianceScore"],
+            "violations_count": len(compliance_result["violations"])
+        })
+        
+        # コンプライアンス結果をレスポンス用に整形
+        return compliance_result, {
+            "score": compliance_result["complianceScore"],
+            "violations": compliance_result["violations"],
+            "analysis": compliance_result["analysis"],
+            "processingTimeMs": int(compliance_processing_time * 1000)
+        }
+        
+    except Exception as compliance_error:
+        logger.error("Error in compliance check", extra={
+            "error": str(compliance_error)
+        })
+        
+        # エラー時のフォールバック結果を返す
+        return None, {
+            "score": 100,  # デフォルトスコア
+            "violations": [],
+            "analysis": f"コンプライアンスチェック中にエラーが発生しました: {str(compliance_error)}",
+            "error": str(compliance_error)
+        }
+
 # DynamoDBにフィードバックデータを保存する関数
 def save_feedback_to_dynamodb(session_id: str, feedback_data: Dict[str, Any], final_metrics: Dict[str, Any], messages: List[Dict[str, Any]], goal_data: Optional[Dict[str, Any]] = None) -> bool:
     """
@@ -217,14 +271,7 @@ def save_feedback_to_dynamodb(session_id: str, feedback_data: Dict[str, Any], fi
         bool: 保存が成功した場合はTrue、それ以外はFalse
     """
     try:
-        # DynamoDBクライアントの初期化
-        dynamodb = boto3.resource('dynamodb')
-        
-        # 環境変数からテーブル名を取得
-        import os
-        table_name = os.environ.get('SESSION_FEEDBACK_TABLE')
-        
-        table = dynamodb.Table(table_name)
+        table = feedback_table
         
         # TTLの設定（180日後に自動削除）
         ttl = int(time.time()) + (180 * 24 * 60 * 60)
@@ -283,14 +330,7 @@ def save_metrics_to_dynamodb(session_id: str, metrics: Dict[str, Any]) -> bool:
         bool: 保存が成功した場合はTrue、それ以外はFalse
     """
     try:
-        # DynamoDBクライアントの初期化
-        dynamodb = boto3.resource('dynamodb')
-        
-        # 環境変数からテーブル名を取得
-        import os
-        table_name = os.environ.get('SESSION_FEEDBACK_TABLE')
-        
-        table = dynamodb.Table(table_name)
+        table = feedback_table
         
         # TTLの設定（24時間後に自動削除）
         ttl = int(time.time()) + 86400
@@ -336,14 +376,7 @@ def get_feedback_from_dynamodb(session_id: str) -> Optional[Dict[str, Any]]:
         Optional[Dict[str, Any]]: フィードバックデータ（存在しない場合はNone）
     """
     try:
-        # DynamoDBクライアントの初期化
-        dynamodb = boto3.resource('dynamodb')
-        
-        # 環境変数からテーブル名を取得
-        import os
-        table_name = os.environ.get('SESSION_FEEDBACK_TABLE')
-        
-        table = dynamodb.Table(table_name)
+        table = feedback_table
         
         # セッションIDで最新のフィードバックを取得（降順でソート）
         response = table.query(
@@ -393,14 +426,7 @@ def save_realtime_metrics_to_dynamodb(session_id: str, metrics_data: Dict[str, A
         bool: 保存が成功した場合はTrue、それ以外はFalse
     """
     try:
-        # DynamoDBクライアントの初期化
-        dynamodb = boto3.resource('dynamodb')
-        
-        # 環境変数からテーブル名を取得
-        import os
-        table_name = os.environ.get('SESSION_FEEDBACK_TABLE')
-        
-        table = dynamodb.Table(table_name)
+        table = feedback_table
         
         # TTLの設定（180日後に自動削除）
         ttl = int(time.time()) + (180 * 24 * 60 * 60)
@@ -420,6 +446,10 @@ def save_realtime_metrics_to_dynamodb(session_id: str, metrics_data: Dict[str, A
             "expireAt": ttl
         }
         
+        # デフォルト値のスコアであれば目印を追加
+        if metrics_data.get("defaultScores"):
+            item["defaultScores"] = True
+        
         # ゴール情報があれば追加
         if "goalStatuses" in metrics_data:
             item["goalStatuses"] = metrics_data["goalStatuses"]
@@ -512,4 +542,10 @@ def calculate_goal_score_from_statuses(goal_statuses: List[Dict[str, Any]], scen
 # APIGatewayRestResolverを使用するためのlambda_handler
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    # 会話履歴の要約の生成（request_history_summary_refreshによる自身の非同期呼び出し）
+    if HISTORY_SUMMARY_EVENT_KEY in event:
+        request = event[HISTORY_SUMMARY_EVENT_KEY]
+        refresh_history_summary(request.get("sessionId", ""), request.get("messages", []), request.get("language", "ja"))
+        return {"success": True}
+    
     return app.resolve(event, context)
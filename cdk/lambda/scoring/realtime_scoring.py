@@ -4,39 +4,246 @@
 
 このモジュールは、ユーザーとNPCの会話をリアルタイムで分析し、
 11の異なるパラメータに基づいてスコアを計算します。
-Strands Agentsを使用して会話の文脈を考慮した分析を行い、
-結果をJSON形式で返します。
+Bedrock Converse APIのツール呼び出しを強制して会話の文脈を考慮した分析を行い、
+スキーマに沿った構造化データとして結果を受け取ります。
 
 Functions:
-    calculate_realtime_scores: 会話データに基づいてリアルタイムスコアを計算
-    parse_scoring_response: LLMの応答をパースしてスコアを抽出
+    calculate_realtime_scores: 会話データに基づいてリアルタイムスコアとゴール達成状況を1回の呼び出しで計算
+    request_history_summary_refresh: 会話履歴の要約の生成を非同期呼び出しで依頼
+    refresh_history_summary: 長い会話履歴の要約を必要に応じて生成して保存
+    parse_realtime_scoring_response: ツール入力として受け取った評価結果からスコアを抽出
     normalize_scores: スコアを正規化して有効な範囲に収める
 """
 
-import json
 import os
-from typing import Dict, Any, List
-from datetime import datetime
-from pydantic import BaseModel, Field
+import time
+import orjson
+from typing import Dict, Any, List, Optional, Tuple
 
 # AWS Lambda Powertools
 from aws_lambda_powertools import Logger
 
-# Strands Agents
-from strands import Agent
-from strands.models import BedrockModel
-
 # Powertools 初期化
 logger = Logger(service="realtime-scoring-service")
 
+# Bedrock呼び出しを省略できる発言の簡易判定
+from heuristic_scorer import is_neutral_turn, select_prior_scores
+
+# converse_streamからのツール入力の読み取り
+from tool_input_stream import read_tool_input_from_stream
+
+# Bedrockクライアント（ストリーミング呼び出し用）・DynamoDBリソース・Lambdaクライアント（共通設定を使用）
+from aws_clients import bedrock_runtime, dynamodb, lambda_client
+
+# 直前のスコアの取得に使用するセッションフィードバックテーブル
+feedback_table = dynamodb.Table(os.environ.get('SESSION_FEEDBACK_TABLE', ''))
+
+# Bedrock呼び出しを省略して直前のスコアを返した場合の分析テキスト（前回の分析を新しい分析として返さない）
+CACHED_ANALYSIS = "(cached)"
+
+
+# 会話履歴のうちプロンプトにそのまま含める直近のメッセージ数
+SCORING_HISTORY_WINDOW = int(os.environ.get('SCORING_HISTORY_WINDOW', '12'))
+# 会話履歴の要約を更新する間隔（要約対象のメッセージ数の増分）
+HISTORY_SUMMARY_INTERVAL = 10
+# 会話履歴の要約を保存するアイテムのソートキー
+# （日時より前に並ぶ固定値のため、最新順で取得するフィードバックの検索には含まれない）
+HISTORY_SUMMARY_SORT_KEY = "#history-summary"
+# 会話履歴の要約の保持期間（24時間後に削除）
+HISTORY_SUMMARY_TTL_SECONDS = 24 * 60 * 60
+# 会話履歴の要約を生成する非同期呼び出しのイベントのキー
+HISTORY_SUMMARY_EVENT_KEY = "refreshHistorySummary"
+# 直前のスコアを保存するアイテムのソートキー（セッションごとに1件を上書きする）
+PRIOR_SCORES_SORT_KEY = "#prior-scores"
+# 整形済み会話履歴のキャッシュに保持するセッション数の上限
+HISTORY_SUMMARY_CACHE_SIZE = 1000
+# セッションIDごとの整形済み会話履歴: (整形済みメッセージ数, 言語, 最後に整形したメッセージの識別情報, 直近の整形済みの行)
+history_line_cache: Dict[str, Tuple[int, str, Tuple[Any, ...], List[str]]] = {}
+
+# 会話履歴に表示する送信者ラベル（(言語, 送信者) -> ラベル、user以外はNPC扱い）
+SENDER_LABELS = {
+    ("en", "user"): "User (Sales Rep)",
+    ("en", "npc"): "NPC (Customer)",
+    ("ja", "user"): "ユーザー（営業担当者）",
+    ("ja", "npc"): "NPC（顧客）"
+}
+
+# スコアリング用のシステムプロンプト
+SCORING_SYSTEM_PROMPT = """あなたは営業トレーニングの専門家です。
+
+重要な出力ルール:
+1. 評価結果は必ず指定されたツールを呼び出して返してください
+2. ツールの入力スキーマに従い、すべての必須項目を埋めてください
+3. スコアは指定された範囲の整数値にしてください"""
+
+# 3つの基本メトリクスの入力スキーマ
+SCORE_PROPERTIES = {
+    "angerLevel": {"type": "integer", "minimum": 1, "maximum": 10, "description": "怒りレベル (1-10)"},
+    "trustLevel": {"type": "integer", "minimum": 1, "maximum": 10, "description": "信頼レベル (1-10)"},
+    "progressLevel": {"type": "integer", "minimum": 1, "maximum": 10, "description": "進捗レベル (1-10)"},
+    "analysis": {"type": "string", "description": "簡潔な分析（50文字以内）"}
+}
+SCORE_REQUIRED = ["angerLevel", "trustLevel", "progressLevel", "analysis"]
+
+# スコアリング結果を受け取るツール（toolChoiceで呼び出しを強制する）
+SUBMIT_SCORES_TOOL = {
+    "toolSpec": {
+        "name": "submit_scores",
+        "description": "会話の3つの基本メトリクスの評価結果を送信する",
+        "inputSchema": {
+            "json": {
+                "type": "object",
+                "properties": SCORE_PROPERTIES,
+                "required": SCORE_REQUIRED
+            }
+        }
+    }
+}
+
+# スコアリングとゴール評価の結果をまとめて受け取るツール
+SUBMIT_SCORES_WITH_GOALS_TOOL = {
+    "toolSpec": {
+        "name": "submit_scores_with_goals",
+        "description": "会話の3つの基本メトリクスと各ゴールの評価結果を送信する",
+        "inputSchema": {
+            "json": {
+                "type": "object",
+                "properties": {
+                    "scores": {
+                        "type": "object",
+                        "properties": SCORE_PROPERTIES,
+                        "required": SCORE_REQUIRED
+                    },
+                    "goalEvaluations": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "goalId": {"type": "string", "description": "ゴールID"},
+                                "progress": {"type": "integer", "minimum": 0, "maximum": 100, "description": "進捗度 (0-100)"},
+                                "achieved": {"type": "boolean", "description": "達成したかどうか"},
+                                "reason": {"type": "string", "description": "評価理由の簡潔な説明"}
+                            },
+                            "required": ["goalId", "progress", "achieved"]
+                        }
+                    }
+                },
+                "required": ["scores", "goalEvaluations"]
+            }
+        }
+    }
+}
+
+# スコアリングとゴール評価をまとめて行う際の評価指示（1回のモデル呼び出しで両方を評価）
+# 毎ターン同一の内容となるようゴールや会話の情報は含めず、システムプロンプトに
+# 載せてプロンプトキャッシュの対象にする
+REALTIME_SCORING_WITH_GOALS_INSTRUCTIONS_EN = """
+You are a real-time evaluation system for sales conversations. Please analyze the conversation given by the user, evaluate three key metrics on a scale of 1-10, and evaluate the progress and achievement status of each goal.
+
+## Three Key Metrics to Evaluate
+1. Anger Level (angerLevel): The degree of customer dissatisfaction or irritation (1=calm, 10=very angry)
+2. Trust Level (trustLevel): The degree of trust the customer has in the sales representative (1=distrust, 10=complete trust)
+3. Progress Level (progressLevel): The degree of progress in the sales negotiation (1=early stage, 10=close to agreement)
+
+## Points to Consider in Metric Evaluation
+- Context and flow of the conversation
+- Customer reactions and emotional expressions
+- Appropriateness of the sales representative's approach
+- Achievement of sales objectives
+- Changes from previous conversation history
+
+## Points to Consider in Goal Evaluation
+1. Evaluate the progress of each goal from 0-100%
+2. A goal is considered achieved when its progress reaches 100%
+3. If there are inappropriate statements or negative reactions, lower or maintain the progress
+4. Consider the priority and whether each goal is required
+
+## Output Format
+Submit the results with the provided tool using the following structure:
+{
+  "scores": {
+    "angerLevel": <integer from 1 to 10>,
+    "trustLevel": <integer from 1 to 10>,
+    "progressLevel": <integer from 1 to 10>,
+    "analysis": "<brief analysis (within 50 characters)>"
+  },
+  "goalEvaluations": [
+    {
+      "goalId": "<goal ID>",
+      "progress": <integer from 0 to 100>,
+      "achieved": <true or false>,
+      "reason": "<brief reason for the evaluation>"
+    }
+  ]
+}
+
+Note: Always submit the results through the tool. All scores must be integer values from 1 to 10.
+"""
+
+REALTIME_SCORING_WITH_GOALS_INSTRUCTIONS_JA = """
+あなたは営業会話のリアルタイム評価システムです。ユーザーから与えられる会話を分析し、3つの基本メトリクスを1-10のスケールで評価するとともに、各ゴールの進捗度と達成状況を評価してください。
+
+## 評価すべき3つの基本メトリクス
+1. 怒りレベル (angerLevel): 顧客の不満や苛立ちの度合い（1=穏やか、10=非常に怒っている）
+2. 信頼レベル (trustLevel): 顧客が営業担当者に対して持つ信頼の度合い（1=不信、10=完全な信頼）
+3. 商談進捗度 (progressLevel): 商談の進行度合い（1=初期段階、10=成約間近）
+
+## メトリクス評価の際の考慮点
+- 会話の文脈と流れ
+- 顧客の反応と感情表現
+- 営業担当者のアプローチの適切性
+- 商談の目的達成度
+- 過去の会話履歴からの変化
+
+## ゴール評価のポイント
+1. 各ゴールの進捗度を0-100%で評価してください
+2. 進捗度が100%に達した場合、ゴールは達成されたと判断します
+3. 不適切な発言や否定的な反応がある場合は、進捗度を下げるか現状維持してください
+4. ゴールの優先度や必須性を考慮して評価してください
+
+## 出力形式
+以下の構造で、指定されたツールを使って評価結果を送信してください:
+{
+  "scores": {
+    "angerLevel": <1から10の整数値>,
+    "trustLevel": <1から10の整数値>,
+    "progressLevel": <1から10の整数値>,
+    "analysis": "<簡潔な分析（50文字以内）>"
+  },
+  "goalEvaluations": [
+    {
+      "goalId": "<ゴールID>",
+      "progress": <0-100の整数値>,
+      "achieved": <trueまたはfalse>,
+      "reason": "<評価理由の簡潔な説明>"
+    }
+  ]
+}
+
+注意：必ずツールを使って評価結果を送信してください。すべてのスコアは1から10の整数値にしてください。
+"""
+
+# ターンごとに変わる入力部分（ゴールの状態と会話のみ）
+REALTIME_SCORING_WITH_GOALS_INPUT_EN = """## Goals to Evaluate
+{goals_json}
+
+## Conversation History
+{conversation_history}
+
+## User's (Sales Representative's) Latest Statement
+{user_input}
+"""
+
+REALTIME_SCORING_WITH_GOALS_INPUT_JA = """## 評価対象のゴール
+{goals_json}
+
+## 会話履歴
+{conversation_history}
+
+## ユーザー（営業担当者）の最新の発言
+{user_input}
+"""
 
-# Pydanticモデル（Structured Output用）
-class RealtimeScores(BaseModel):
-    """リアルタイムスコアリング結果"""
-    angerLevel: int = Field(description="怒りレベル (1-10)", ge=1, le=10)
-    trustLevel: int = Field(description="信頼レベル (1-10)", ge=1, le=10)
-    progressLevel: int = Field(description="進捗レベル (1-10)", ge=1, le=10)
-    analysis: str = Field(description="簡潔な分析（50文字以内）", max_length=50)
 
 def calculate_realtime_scores(
     user_input: str,
@@ -44,7 +251,8 @@ def calculate_realtime_scores(
     session_id: str,
     scenario_goals: List[Dict[str, Any]] = None,
     current_goal_statuses: List[Dict[str, Any]] = None,
-    language: str = "ja"
+    language: str = "ja",
+    stream: bool = True
 ) -> Dict[str, Any]:
     """
     会話データに基づいてリアルタイムスコアを計算
@@ -59,6 +267,8 @@ def calculate_realtime_scores(
         session_id (str): セッションID
         scenario_goals (List[Dict[str, Any]], optional): シナリオのゴール定義
         current_goal_statuses (List[Dict[str, Any]], optional): 現在のゴール達成状況
+        language (str): 言語コード（"ja"または"en"）
+        stream (bool): Bedrockの応答をストリーミングで受信するかどうか
         
     Returns:
         Dict[str, Any]: 計算されたスコア情報を含む辞書
@@ -70,38 +280,74 @@ def calculate_realtime_scores(
             "timestamp": int  # タイムスタンプ（ミリ秒）
         }
     """
+    # 呼び出しごとに1回だけ現在時刻（ミリ秒）を取得して使い回す
+    now_ms = time.time_ns() // 1_000_000
+    
     try:
-        # 会話履歴をテキスト形式に整形
-        conversation_text = format_conversation_history(previous_messages, language)
+        # 未達成のゴールを抽出（ゴールデータがある場合）
+        unachieved_goals, unachieved_goal_statuses = [], []
+        if scenario_goals and current_goal_statuses:
+            unachieved_goals, unachieved_goal_statuses = select_unachieved_goals(
+                scenario_goals,
+                current_goal_statuses
+            )
         
-        # プロンプトの作成（3つの基本メトリクスのみ）
-        prompt = create_realtime_scoring_prompt(user_input, conversation_text, language)
+        # あいさつや相づちのみの発言はスコアが動かないため、保存済みの直前のスコアをそのまま返す
+        # （未達成のゴールがある場合は発言がゴールを達成し得るため、常にモデルで評価する）
+        prior = None
+        if not unachieved_goals and is_neutral_turn(user_input):
+            prior = get_prior_scores(session_id)
+        if prior:
+            scores = dict(prior)
+            scores["analysis"] = CACHED_ANALYSIS
+            if scenario_goals and current_goal_statuses:
+                scores["goalStatuses"] = current_goal_statuses.copy()
+            scores["timestamp"] = now_ms
+            scores["sessionId"] = session_id
+            
+            logger.info(f"スコアに影響しない発言のためBedrock呼び出しを省略しました: {orjson.dumps(scores).decode()}")
+            
+            return scores
         
-        # Claude 3.5 Haikuを使用して分析
-        scoring_response = invoke_bedrock_model(prompt)
-        logger.debug(f"scoring_response: {scoring_response}")
+        # 会話履歴をテキスト形式に整形
+        conversation_text = format_conversation_history(previous_messages, language, session_id)
         
-        # 応答をパースしてスコアを抽出
-        scores = parse_realtime_scoring_response(scoring_response)
+        if unachieved_goals:
+            # スコアリングとゴール評価を1回のモデル呼び出しにまとめる
+            goals_json = build_goals_json(unachieved_goals, unachieved_goal_statuses)
+            prompt = create_realtime_scoring_with_goals_prompt(
+                user_input, conversation_text, goals_json, language
+            )
+            scoring_response = invoke_bedrock_model(
+                prompt, stream, get_scoring_with_goals_instructions(language), SUBMIT_SCORES_WITH_GOALS_TOOL
+            )
+            logger.debug(f"scoring_response: {scoring_response}")
+            
+            scores, goal_evaluations = parse_realtime_scoring_with_goals_response(scoring_response)
+            scores["goalStatuses"] = apply_goal_evaluations(current_goal_statuses, goal_evaluations, now_ms)
+            logger.info(f"ゴール評価完了: {orjson.dumps(scores['goalStatuses']).decode()}")
+        else:
+            # プロンプトの作成（3つの基本メトリクスのみ）
+            prompt = create_realtime_scoring_prompt(user_input, conversation_text, language)
+            
+            # Claude 3.5 Haikuを使用して分析
+            scoring_response = invoke_bedrock_model(prompt, stream)
+            logger.debug(f"scoring_response: {scoring_response}")
+            
+            # 応答をパースしてスコアを抽出
+            scores = parse_realtime_scoring_response(scoring_response)
+            
+            # 全ゴール達成済みの場合は現在のステータスをそのまま返す
+            if scenario_goals and current_goal_statuses:
+                scores["goalStatuses"] = current_goal_statuses.copy()
         
         # タイムスタンプを追加
-        scores["timestamp"] = int(datetime.now().timestamp() * 1000)
+        scores["timestamp"] = now_ms
         
         # セッションIDを追加
         scores["sessionId"] = session_id
         
-        # ゴール評価を実行（ゴールデータがある場合）
-        if scenario_goals and current_goal_statuses:
-            updated_goal_statuses = evaluate_goals(
-                user_input, 
-                previous_messages, 
-                scenario_goals, 
-                current_goal_statuses
-            )
-            scores["goalStatuses"] = updated_goal_statuses
-            logger.info(f"ゴール評価完了: {json.dumps(updated_goal_statuses, ensure_ascii=False)}")
-        
-        logger.info(f"リアルタイムスコア計算完了: {json.dumps(scores, ensure_ascii=False)}")
+        logger.info(f"リアルタイムスコア計算完了: {orjson.dumps(scores).decode()}")
         
         return scores
         
@@ -113,11 +359,77 @@ def calculate_realtime_scores(
             "trustLevel": 5,
             "progressLevel": 3,
             "analysis": f"分析中にエラーが発生しました: {str(e)}",
+            "isDefault": True,
             "sessionId": session_id,
-            "timestamp": int(datetime.now().timestamp() * 1000)
+            "timestamp": now_ms
         }
 
-def format_conversation_history(messages: List[Dict[str, Any]], language: str = "ja") -> str:
+
+def get_prior_scores(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    DynamoDBに保存済みの直前のスコアを取得
+    
+    Lambdaインスタンスをまたいでも同じ結果となるよう、save_prior_scoresで
+    セッションごとに1件保存しているアイテムを参照します。取得に失敗した場合は
+    Noneを返し、通常どおりモデルで評価します。
+    
+    Args:
+        session_id (str): セッションID
+        
+    Returns:
+        Optional[Dict[str, Any]]: 直前のスコア（使用できない場合はNone）
+    """
+    if not session_id:
+        return None
+    
+    try:
+        response = feedback_table.get_item(
+            Key={"sessionId": session_id, "createdAt": PRIOR_SCORES_SORT_KEY},
+            ProjectionExpression="angerLevel, trustLevel, progressLevel, defaultScores"
+        )
+        return select_prior_scores(response.get("Item"))
+    except Exception as e:
+        logger.warning(f"直前のスコアの取得に失敗しました: {str(e)}")
+        return None
+
+
+def save_prior_scores(session_id: str, metrics_data: Dict[str, Any]) -> None:
+    """
+    次の発言で直前のスコアとして使用するスコアを保存
+    
+    セッションの全realtime-metricsレコードを読まずに済むよう、最新のスコアのみを
+    固定のソートキーのアイテムに上書き保存します。デフォルト値のスコアは
+    defaultScoresの目印付きで保存し、直前のスコアとしては使用しません。
+    
+    Args:
+        session_id (str): セッションID
+        metrics_data (Dict[str, Any]): 保存するリアルタイムメトリクス
+    """
+    if not session_id:
+        return
+    
+    item = {
+        "sessionId": session_id,
+        "createdAt": PRIOR_SCORES_SORT_KEY,
+        "dataType": "prior-scores",
+        "angerLevel": metrics_data.get("angerLevel", 0),
+        "trustLevel": metrics_data.get("trustLevel", 0),
+        "progressLevel": metrics_data.get("progressLevel", 0),
+        "expireAt": int(time.time()) + HISTORY_SUMMARY_TTL_SECONDS
+    }
+    if metrics_data.get("defaultScores"):
+        item["defaultScores"] = True
+    
+    try:
+        feedback_table.put_item(Item=item)
+    except Exception as e:
+        logger.warning(f"直前のスコアの保存に失敗しました: {str(e)}")
+
+def format_conversation_history(
+    messages: List[Dict[str, Any]],
+    language: str = "ja",
+    session_id: str = None
+) -> str:
     """
     会話履歴をテキスト形式に整形
     
@@ -125,11 +437,17 @@ def format_conversation_history(messages: List[Dict[str, Any]], language: str =
     テキストに変換します。言語パラメータに基づいて、ラベルを日本語または英語で
     表示します。
     
+    メッセージ数が SCORING_HISTORY_WINDOW を超える場合は直近のメッセージのみを
+    そのまま含め、それより前の会話は保存済みの要約に置き換えます。
+    要約の生成はrequest_history_summary_refreshで応答とは別の実行に依頼するため、
+    要約がまだ無い場合は直近のメッセージのみを含めます。
+    
     Args:
         messages (List[Dict[str, Any]]): 過去のメッセージリスト
             - sender (str): メッセージの送信者 ("user" または "npc")
             - content (str): メッセージの内容
         language (str): 言語コード（"ja" または "en"）
+        session_id (str, optional): 要約の取得・整形済み行のキャッシュに使用するセッションID
             
     Returns:
         str: フォーマットされた会話履歴
@@ -137,15 +455,257 @@ def format_conversation_history(messages: List[Dict[str, Any]], language: str =
     if not messages:
         return "No conversation history." if language == "en" else "会話履歴はありません。"
     
-    history_lines = []
-    for msg in messages:
-        if language == "en":
-            sender_name = 'User (Sales Rep)' if msg.get('sender') == 'user' else 'NPC (Customer)'
-        else:
-            sender_name = 'ユーザー（営業担当者）' if msg.get('sender') == 'user' else 'NPC（顧客）'
-        history_lines.append(f"{sender_name}: {msg.get('content', '')}")
+    summary = ""
+    if len(messages) > SCORING_HISTORY_WINDOW:
+        stored = get_stored_history_summary(session_id)
+        if stored and stored.get("language") == language:
+            summary = stored.get("summary", "")
+    
+    history_text = "\n".join(get_window_lines(messages, language, session_id))
+    
+    if summary:
+        summary_label = "Summary of earlier conversation" if language == "en" else "これまでの会話の要約"
+        return f"{summary_label}: {summary}\n\n{history_text}"
+    
+    return history_text
+
+
+def format_message_lines(messages: List[Dict[str, Any]], language: str = "ja") -> str:
+    """
+    メッセージを「送信者: 内容」形式の行に整形
+    
+    Args:
+        messages (List[Dict[str, Any]]): メッセージリスト
+        language (str): 言語コード（"ja" または "en"）
+        
+    Returns:
+        str: 改行区切りの会話テキスト
+    """
+    return "\n".join(format_message_line_list(messages, language))
+
+
+def format_message_line_list(messages: List[Dict[str, Any]], language: str = "ja") -> List[str]:
+    """
+    メッセージごとに「送信者: 内容」形式の行を作成
+    
+    Args:
+        messages (List[Dict[str, Any]]): メッセージリスト
+        language (str): 言語コード（"ja" または "en"）
+        
+    Returns:
+        List[str]: 整形済みの行のリスト
+    """
+    language = "en" if language == "en" else "ja"
+    npc_label = SENDER_LABELS[(language, "npc")]
+    
+    return [
+        f"{SENDER_LABELS.get((language, msg.get('sender')), npc_label)}: {msg.get('content', '')}"
+        for msg in messages
+    ]
+
+
+def get_window_lines(messages: List[Dict[str, Any]], language: str = "ja", session_id: str = None) -> List[str]:
+    """
+    直近 SCORING_HISTORY_WINDOW 件のメッセージを整形した行を取得
+    
+    会話履歴は通常毎ターン末尾にメッセージが追加されるだけなので、セッションごとに
+    前回の整形済み行をキャッシュし、新しく増えたメッセージのみを整形して追加します。
+    前回最後に整形したメッセージが同じ位置に無い場合（呼び出し側で履歴を切り詰めた場合など）や
+    言語が変わった場合は作り直します。
+    
+    Args:
+        messages (List[Dict[str, Any]]): 過去のメッセージリスト
+        language (str): 言語コード（"ja" または "en"）
+        session_id (str, optional): キャッシュに使用するセッションID（Noneの場合はキャッシュしない）
+        
+    Returns:
+        List[str]: 直近のメッセージの整形済みの行
+    """
+    cached = history_line_cache.get(session_id) if session_id else None
+    
+    if (
+        cached
+        and cached[1] == language
+        and 0 < cached[0] <= len(messages)
+        and message_fingerprint(messages[cached[0] - 1]) == cached[2]
+    ):
+        lines = cached[3] + format_message_line_list(messages[cached[0]:], language)
+    else:
+        lines = format_message_line_list(messages[-SCORING_HISTORY_WINDOW:], language)
+    lines = lines[-SCORING_HISTORY_WINDOW:]
+    
+    if session_id and messages:
+        # 長時間稼働したインスタンスでキャッシュが肥大化しないよう上限を設ける
+        if session_id not in history_line_cache and len(history_line_cache) >= HISTORY_SUMMARY_CACHE_SIZE:
+            history_line_cache.clear()
+        history_line_cache[session_id] = (len(messages), language, message_fingerprint(messages[-1]), lines)
+    
+    return lines
+
+
+def message_fingerprint(message: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    整形済み行のキャッシュが同じ会話の続きかを確認するためのメッセージの識別情報
     
-    return "\n".join(history_lines)
+    Args:
+        message (Dict[str, Any]): メッセージ
+        
+    Returns:
+        Tuple[Any, ...]: メッセージID・タイムスタンプ・送信者・内容の組
+    """
+    return (
+        message.get("messageId") or message.get("id"),
+        message.get("timestamp"),
+        message.get("sender"),
+        message.get("content")
+    )
+
+
+def get_stored_history_summary(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    保存済みの会話履歴の要約を取得
+    
+    要約はセッションフィードバックテーブルに保存し、すべてのLambdaインスタンスで共有します。
+    
+    Args:
+        session_id (str): セッションID
+        
+    Returns:
+        Optional[Dict[str, Any]]: summarizedCount / summary / language を含むアイテム（無い場合はNone）
+    """
+    if not session_id:
+        return None
+    
+    try:
+        response = feedback_table.get_item(
+            Key={"sessionId": session_id, "createdAt": HISTORY_SUMMARY_SORT_KEY},
+            ProjectionExpression="summarizedCount, #summary, #language",
+            ExpressionAttributeNames={"#summary": "summary", "#language": "language"}
+        )
+        return response.get("Item")
+    except Exception as e:
+        logger.warning(f"会話履歴の要約の取得に失敗しました: {str(e)}")
+        return None
+
+
+def is_history_summary_stale(session_id: str, messages: List[Dict[str, Any]], language: str = "ja") -> bool:
+    """
+    会話履歴の要約を再生成する必要があるかを判定
+    
+    保存済みの要約から要約対象のメッセージが HISTORY_SUMMARY_INTERVAL 件増えるまでは
+    再生成しません。
+    
+    Args:
+        session_id (str): セッションID
+        messages (List[Dict[str, Any]]): 過去のメッセージリスト
+        language (str): 言語コード（"ja" または "en"）
+        
+    Returns:
+        bool: 要約を再生成する必要がある場合はTrue
+    """
+    if not session_id or len(messages) <= SCORING_HISTORY_WINDOW:
+        return False
+    
+    stored = get_stored_history_summary(session_id)
+    return not (
+        stored
+        and stored.get("language") == language
+        and len(messages) - SCORING_HISTORY_WINDOW - int(stored.get("summarizedCount", 0)) < HISTORY_SUMMARY_INTERVAL
+    )
+
+
+def request_history_summary_refresh(session_id: str, messages: List[Dict[str, Any]], language: str = "ja") -> None:
+    """
+    会話履歴の要約の生成を自身の非同期呼び出しで依頼
+    
+    要約の生成（Bedrock呼び出しと保存）はスコアリングの応答を待たせないよう、
+    InvocationType="Event" で呼び出した別の実行で行います。この関数は要約が
+    古いかの確認と呼び出しの依頼のみを行うため、すぐに完了します。
+    失敗した場合は警告ログのみ出力し、保存済みの要約を使い続けます。
+    
+    Args:
+        session_id (str): セッションID
+        messages (List[Dict[str, Any]]): 過去のメッセージリスト
+        language (str): 言語コード（"ja" または "en"）
+    """
+    if not is_history_summary_stale(session_id, messages, language):
+        return
+    
+    try:
+        lambda_client.invoke(
+            FunctionName=os.environ["AWS_LAMBDA_FUNCTION_NAME"],
+            InvocationType="Event",
+            Payload=orjson.dumps({
+                HISTORY_SUMMARY_EVENT_KEY: {"sessionId": session_id, "messages": messages, "language": language}
+            })
+        )
+    except Exception as e:
+        logger.warning(f"会話履歴の要約の生成の依頼に失敗しました: {str(e)}")
+
+
+def refresh_history_summary(session_id: str, messages: List[Dict[str, Any]], language: str = "ja") -> None:
+    """
+    会話履歴の要約を必要に応じて生成して保存
+    
+    request_history_summary_refreshによる非同期呼び出しの中で実行します。
+    同じ要約の生成が重複して依頼された場合に備え、保存前に改めて要約が古いかを確認します。
+    失敗した場合は警告ログのみ出力し、保存済みの要約を使い続けます。
+    
+    Args:
+        session_id (str): セッションID
+        messages (List[Dict[str, Any]]): 過去のメッセージリスト
+        language (str): 言語コード（"ja" または "en"）
+    """
+    if not is_history_summary_stale(session_id, messages, language):
+        return
+    
+    older_messages = messages[:-SCORING_HISTORY_WINDOW]
+    try:
+        summary = summarize_conversation(older_messages, language)
+        feedback_table.put_item(Item={
+            "sessionId": session_id,
+            "createdAt": HISTORY_SUMMARY_SORT_KEY,
+            "dataType": "history-summary",
+            "summarizedCount": len(older_messages),
+            "summary": summary,
+            "language": language,
+            "expireAt": int(time.time()) + HISTORY_SUMMARY_TTL_SECONDS
+        })
+    except Exception as e:
+        logger.warning(f"会話履歴の要約に失敗しました: {str(e)}")
+
+
+def summarize_conversation(messages: List[Dict[str, Any]], language: str = "ja") -> str:
+    """
+    会話を短い要約テキストに変換
+    
+    Args:
+        messages (List[Dict[str, Any]]): 要約対象のメッセージ
+        language (str): 言語コード（"ja" または "en"）
+        
+    Returns:
+        str: 要約テキスト
+    """
+    if language == "en":
+        prompt = (
+            "Summarize the following sales conversation in 3 sentences or fewer, "
+            "focusing on the customer's concerns, attitude and how the negotiation has progressed. "
+            "Output only the summary.\n\n"
+        )
+    else:
+        prompt = (
+            "以下の営業会話を、顧客の懸念・態度と商談の進み具合を中心に3文以内で要約してください。"
+            "要約のみを出力してください。\n\n"
+        )
+    
+    response = bedrock_runtime.converse(
+        modelId=os.environ.get('BEDROCK_MODEL_SCORING'),
+        messages=[{"role": "user", "content": [{"text": prompt + format_message_lines(messages, language)}]}],
+        inferenceConfig={"temperature": 0.1, "maxTokens": 300}
+    )
+    
+    return response["output"]["message"]["content"][0]["text"].strip()
+
 
 def create_realtime_scoring_prompt(user_input: str, conversation_history: str, language: str = "ja") -> str:
     """
@@ -187,7 +747,7 @@ You are a real-time evaluation system for sales conversations. Please analyze th
 - Changes from previous conversation history
 
 ## Output Format
-Please respond in the following JSON format:
+Submit the results with the provided tool using the following structure:
 ```json
 {{
   "angerLevel": <integer from 1 to 10>,
@@ -197,7 +757,7 @@ Please respond in the following JSON format:
 }}
 ```
 
-Note: Please respond only in the JSON format above without any additional explanation. All scores must be integer values from 1 to 10.
+Note: Always submit the results through the tool. All scores must be integer values from 1 to 10.
 """
     else:
         return f"""
@@ -222,7 +782,7 @@ Note: Please respond only in the JSON format above without any additional explan
 - 過去の会話履歴からの変化
 
 ## 出力形式
-以下のJSON形式で回答してください:
+以下の構造で、指定されたツールを使って評価結果を送信してください:
 ```json
 {{
   "angerLevel": <1から10の整数値>,
@@ -232,22 +792,78 @@ Note: Please respond only in the JSON format above without any additional explan
 }}
 ```
 
-注意：必ず上記のJSON形式で回答し、他の説明は含めないでください。すべてのスコアは1から10の整数値にしてください。
+注意：必ずツールを使って評価結果を送信してください。すべてのスコアは1から10の整数値にしてください。
 """
 
 
-def invoke_bedrock_model(prompt: str) -> str:
+def create_realtime_scoring_with_goals_prompt(
+    user_input: str,
+    conversation_history: str,
+    goals_json: str,
+    language: str = "ja"
+) -> str:
+    """
+    スコアリングとゴール評価を同時に行うプロンプトを作成
+    
+    評価指示（get_scoring_with_goals_instructions）はシステムプロンプトに
+    載せるため、ここではターンごとに変わるゴールの状態と会話のみを組み立てます。
+    
+    Args:
+        user_input (str): ユーザーの最新の発言
+        conversation_history (str): フォーマット済みの会話履歴
+        goals_json (str): 評価対象ゴールのJSON文字列
+        language (str): 言語コード（"ja"または"en"）
+        
+    Returns:
+        str: スコアリング・ゴール評価用のプロンプト
+    """
+    template = REALTIME_SCORING_WITH_GOALS_INPUT_EN if language == "en" else REALTIME_SCORING_WITH_GOALS_INPUT_JA
+    
+    return template.format(
+        conversation_history=conversation_history,
+        user_input=user_input,
+        goals_json=goals_json
+    )
+
+
+def get_scoring_with_goals_instructions(language: str = "ja") -> str:
+    """
+    スコアリング・ゴール評価の評価指示を取得
+    
+    Args:
+        language (str): 言語コード（"ja"または"en"）
+        
+    Returns:
+        str: システムプロンプトに追加する評価指示
+    """
+    return REALTIME_SCORING_WITH_GOALS_INSTRUCTIONS_EN if language == "en" else REALTIME_SCORING_WITH_GOALS_INSTRUCTIONS_JA
+
+
+def invoke_bedrock_model(
+    prompt: str,
+    stream: bool = True,
+    instructions: str = "",
+    tool: Dict[str, Any] = SUBMIT_SCORES_TOOL
+) -> Dict[str, Any]:
     """
     Bedrockモデルを呼び出してスコアリング結果を取得
     
-    Strands Agentsを使用して、プロンプトに基づいた
-    スコアリング結果を取得します。
+    toolConfigで指定したツールの呼び出しを強制し、ツールの入力として
+    スキーマに沿った評価結果を受け取ります。stream=Trueの場合は
+    converse_streamで受信し、ツール入力のブロックが閉じた時点でストリームを
+    打ち切ります。
+    
+    システムプロンプト（共通ルール + 評価指示）とツール定義は毎ターン同一のため、
+    直後にキャッシュポイントを置いてプロンプトキャッシュを有効にします。
     
     Args:
-        prompt (str): スコアリング用のプロンプト
+        prompt (str): スコアリング用のプロンプト（ターンごとに変わる部分）
+        stream (bool): ストリーミングで応答を受信するかどうか
+        instructions (str): システムプロンプトに追加する静的な評価指示
+        tool (Dict[str, Any]): 呼び出しを強制するツールの定義
         
     Returns:
-        str: モデルからの応答テキスト
+        Dict[str, Any]: ツールの入力（評価結果）
         
     Raises:
         Exception: モデル呼び出し中にエラーが発生した場合
@@ -255,82 +871,72 @@ def invoke_bedrock_model(prompt: str) -> str:
     # スコアリング用のモデルIDを取得
     model_id = os.environ.get('BEDROCK_MODEL_SCORING')
     
-    system_prompt = """あなたは営業トレーニングの専門家です。
-
-重要な出力ルール:
-1. 必ず有効なJSON形式のみで出力してください
-2. JSONの前後に説明文、コメント、コードブロック記号（```）は一切含めないでください
-3. 出力は { で始まり } で終わる有効なJSONオブジェクトのみにしてください
-4. マークダウン形式やその他の装飾は使用しないでください
-
-出力例:
-{"angerLevel": 5, "trustLevel": 7, "progressLevel": 3, "analysis": "分析結果"}"""
+    system_prompt = f"{SCORING_SYSTEM_PROMPT}\n{instructions}" if instructions else SCORING_SYSTEM_PROMPT
+    
+    request = {
+        "modelId": model_id,
+        "system": [
+            {"text": system_prompt},
+            {"cachePoint": {"type": "default"}}
+        ],
+        "messages": [{"role": "user", "content": [{"text": prompt}]}],
+        "inferenceConfig": {
+            "temperature": 0.1,  # 正確な評価のために低い温度を設定
+            "maxTokens": 2000  # ゴール評価を同時に返す場合に備えて余裕を持たせる
+        },
+        "toolConfig": {
+            "tools": [tool],
+            "toolChoice": {"tool": {"name": tool["toolSpec"]["name"]}}
+        }
+    }
     
     try:
-        logger.info(f"Bedrockモデル呼び出し（Strands Agents使用）: {model_id}")
+        if stream:
+            logger.info(f"Bedrockモデル呼び出し（converse_stream使用）: {model_id}")
+            
+            response = bedrock_runtime.converse_stream(**request)
+            tool_input = read_tool_input_from_stream(response["stream"])
+            
+            logger.info("Bedrockモデル呼び出し成功（converse_stream）")
+            
+            return tool_input
         
-        # BedrockModelを作成
-        bedrock_model = BedrockModel(
-            model_id=model_id,
-            temperature=0.1,  # 正確な評価のために低い温度を設定
-            max_tokens=1000
-        )
+        logger.info(f"Bedrockモデル呼び出し（converse使用）: {model_id}")
         
-        # Agentを作成して呼び出し
-        agent = Agent(
-            model=bedrock_model,
-            system_prompt=system_prompt
+        response = bedrock_runtime.converse(**request)
+        tool_input = next(
+            (block["toolUse"]["input"] for block in response["output"]["message"]["content"]
+             if "toolUse" in block),
+            {}
         )
-        result = agent(prompt)
-        
-        # 応答テキストを取得
-        model_response = str(result)
         
-        logger.info("Bedrockモデル呼び出し成功（Strands Agents）")
+        logger.info("Bedrockモデル呼び出し成功（converse）")
         
-        return model_response
+        return tool_input
         
     except Exception as e:
         logger.error(f"Bedrockモデル呼び出しエラー: {str(e)}")
         raise
 
-def parse_realtime_scoring_response(response: str) -> Dict[str, Any]:
+
+def parse_realtime_scoring_response(tool_input: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Claude 3.5 Haikuのリアルタイム評価応答をパースして3つの基本メトリクスを抽出
+    ツール入力として受け取ったリアルタイム評価結果から3つの基本メトリクスを抽出
     
-    モデルからの応答テキストをパースし、3つの基本メトリクス情報を抽出します。
-    JSON形式でない場合やパースエラーが発生した場合は、
-    デフォルト値を返します。
+    メトリクスが含まれていない場合は、デフォルト値を返します。
     
     Args:
-        response (str): モデルからの応答テキスト
+        tool_input (Dict[str, Any]): submit_scores ツールの入力
         
     Returns:
-        Dict[str, Any]: パースされたスコア情報（3つの基本メトリクスのみ）
+        Dict[str, Any]: 正規化されたスコア情報（3つの基本メトリクスのみ）
     """
-    try:
-        # 応答からJSONを抽出
-        json_start = response.find('{')
-        json_end = response.rfind('}') + 1
-        
-        if json_start >= 0 and json_end > json_start:
-            json_str = response[json_start:json_end]
-            scores = json.loads(json_str)
-            
-            # 3つの基本メトリクスのみを正規化
-            normalized_scores = normalize_realtime_scores(scores)
-            
-            return normalized_scores
-        else:
-            logger.warning(f"JSON形式の応答が見つかりません: {response}")
-            return create_default_realtime_scores()
-            
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON解析エラー: {str(e)}, 応答: {response}")
-        return create_default_realtime_scores()
-    except Exception as e:
-        logger.error(f"応答パースエラー: {str(e)}")
+    if not isinstance(tool_input, dict) or not any(key in tool_input for key in SCORE_REQUIRED[:3]):
+        logger.warning(f"応答にスコアが見つかりません: {tool_input}")
         return create_default_realtime_scores()
+    
+    # 3つの基本メトリクスのみを正規化
+    return normalize_realtime_scores(tool_input)
 
 
 def normalize_realtime_scores(scores: Dict[str, Any]) -> Dict[str, Any]:
@@ -370,189 +976,175 @@ def normalize_realtime_scores(scores: Dict[str, Any]) -> Dict[str, Any]:
     
     return normalized
 
-def evaluate_goals(
-    user_input: str,
-    previous_messages: List[Dict[str, Any]],
+def parse_realtime_scoring_with_goals_response(tool_input: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    スコアリング・ゴール評価の統合結果を取り出す
+    
+    {"scores": {...}, "goalEvaluations": [...]} 形式のツール入力から、
+    3つの基本メトリクスとゴール評価結果を取り出します。
+    
+    Args:
+        tool_input (Dict[str, Any]): submit_scores_with_goals ツールの入力
+        
+    Returns:
+        Tuple[Dict[str, Any], List[Dict[str, Any]]]: 正規化済みスコアとゴール評価結果
+    """
+    if not isinstance(tool_input, dict):
+        logger.warning(f"応答にスコアが見つかりません: {tool_input}")
+        return create_default_realtime_scores(), []
+    
+    return (
+        parse_realtime_scoring_response(tool_input.get("scores")),
+        parse_goal_array(tool_input.get("goalEvaluations"))
+    )
+
+
+def parse_goal_array(goal_evaluations: Any) -> List[Dict[str, Any]]:
+    """
+    モデルが返したゴール評価配列を整形
+    
+    Args:
+        goal_evaluations (Any): 応答内の goalEvaluations の値
+        
+    Returns:
+        List[Dict[str, Any]]: goalId / progress(0-100) / achieved のみを含む評価結果
+    """
+    if not isinstance(goal_evaluations, list):
+        logger.warning(f"ゴール評価結果が配列ではありません: {goal_evaluations}")
+        return []
+    
+    result = []
+    for eval_item in goal_evaluations:
+        if not isinstance(eval_item, dict):
+            continue
+        try:
+            progress = max(0, min(100, int(eval_item.get("progress", 0))))
+        except (ValueError, TypeError):
+            progress = 0
+        result.append({
+            "goalId": eval_item.get("goalId"),
+            "progress": progress,
+            "achieved": eval_item.get("achieved", False)
+        })
+    
+    logger.info(f"ゴール評価結果: {orjson.dumps(result).decode()}")
+    return result
+
+
+def select_unachieved_goals(
     scenario_goals: List[Dict[str, Any]],
     current_goal_statuses: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
-    ゴールの達成状況を評価する
+    評価対象となる未達成のゴールを抽出する
     
-    ユーザーの入力と会話履歴に基づいて、各ゴールの達成状況を評価します。
-    Claude 3.5 Haikuを使用して、各ゴールの進捗度を評価します。
     既に達成済みのゴールは再評価されません。
     
     Args:
-        user_input (str): ユーザーの最新の発言
-        previous_messages (List[Dict[str, Any]]): 過去の会話履歴
         scenario_goals (List[Dict[str, Any]]): シナリオのゴール定義
         current_goal_statuses (List[Dict[str, Any]]): 現在のゴール達成状況
         
     Returns:
-        List[Dict[str, Any]]: 更新されたゴール達成状況
+        Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: 未達成ゴールの定義とそのステータス
     """
-    try:
-        # 現在のメッセージを作成（最新のユーザー入力）
-        current_message = {
-            "sender": "user",
-            "content": user_input
-        }
-        
-        # 会話履歴をテキスト形式に整形
-        conversation_text = format_conversation_history(previous_messages + [current_message])
-        
-        # 達成済みでないゴールを取得
-        unachieved_goals = []
-        unachieved_goal_statuses = []
-        
-        for goal_status in current_goal_statuses:
-            # 既に達成済みのゴールはスキップ
-            if goal_status.get("achieved", False):
-                continue
-                
-            # 対応するゴール定義を検索
-            goal_id = goal_status.get("goalId")
-            goal = next((g for g in scenario_goals if g.get("id") == goal_id), None)
-            
-            if goal:
-                unachieved_goals.append(goal)
-                unachieved_goal_statuses.append(goal_status)
-        
-        # 達成済みのゴールを含む更新後のゴールステータスリスト
-        updated_goal_statuses = current_goal_statuses.copy()
-        
-        # 達成済みでないゴールがない場合はそのまま返す
-        if not unachieved_goals:
-            return updated_goal_statuses
-        
-        # Bedrockを使用してゴール評価を行う
-        goal_evaluation = evaluate_goals_with_bedrock(
-            conversation_text,
-            unachieved_goals,
-            unachieved_goal_statuses
-        )
-        
-        # 評価結果を反映
-        for evaluated_goal in goal_evaluation:
-            goal_id = evaluated_goal.get("goalId")
-            progress = evaluated_goal.get("progress", 0)
-            achieved = evaluated_goal.get("achieved", False)
+    # ゴールIDからゴール定義を引けるようにしておく（同じIDが複数ある場合は先頭を優先）
+    goals_by_id = {goal.get("id"): goal for goal in reversed(scenario_goals)}
+    
+    unachieved_goals = []
+    unachieved_goal_statuses = []
+    
+    for goal_status in current_goal_statuses:
+        # 既に達成済みのゴールはスキップ
+        if goal_status.get("achieved", False):
+            continue
             
-            # 更新対象のゴールステータスを探す
-            for i, status in enumerate(updated_goal_statuses):
-                if status.get("goalId") == goal_id:
-                    # 達成状態を更新
-                    updated_goal_statuses[i] = {
-                        "goalId": goal_id,
-                        "progress": progress,
-                        "achieved": achieved,
-                        "achievedAt": int(datetime.now().timestamp() * 1000) if achieved else None
-                    }
-                    break
+        # 対応するゴール定義を検索
+        goal = goals_by_id.get(goal_status.get("goalId"))
         
-        return updated_goal_statuses
-    except Exception as e:
-        logger.error(f"ゴール評価エラー: {str(e)}")
-        # エラー時は元のゴールステータスをそのまま返す
-        return current_goal_statuses
+        if goal:
+            unachieved_goals.append(goal)
+            unachieved_goal_statuses.append(goal_status)
+    
+    return unachieved_goals, unachieved_goal_statuses
+
 
-def evaluate_goals_with_bedrock(
-    conversation_text: str,
+def build_goals_json(
     goals: List[Dict[str, Any]],
     current_goal_statuses: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
+) -> str:
     """
-    Bedrockを使用してゴールの達成状況を評価する
+    プロンプトに埋め込むゴール情報をJSON文字列に整形
+    
+    同じゴールの状態からは常に同じ文字列が得られるよう、ゴールID順に並べます。
     
     Args:
-        conversation_text (str): フォーマット済みの会話履歴
         goals (List[Dict[str, Any]]): 評価対象のゴールリスト
         current_goal_statuses (List[Dict[str, Any]]): 現在のゴール達成状況
         
     Returns:
-        List[Dict[str, Any]]: 更新されたゴール達成状況
+        str: ゴール情報のJSON文字列
     """
-    try:
-        # ゴール情報をJSON形式に整形
-        goals_json = json.dumps([{
-            "id": goal.get("id"),
-            "description": goal.get("description"),
-            "criteria": goal.get("criteria", []),
-            "isRequired": goal.get("isRequired", False),
-            "priority": goal.get("priority", 3),
-            "currentProgress": next(
-                (status.get("progress", 0) for status in current_goal_statuses 
-                 if status.get("goalId") == goal.get("id")), 
-                0
-            )
-        } for goal in goals], ensure_ascii=False)
-        
-        # プロンプトの作成
-        prompt = f"""
-あなたは営業会話のゴール達成度を評価するシステムです。以下の会話とゴール情報を分析し、各ゴールの進捗度と達成状況を評価してください。
-
-## 会話履歴
-{conversation_text}
+    # ゴールIDごとの現在の進捗度（同じIDが複数ある場合は先頭を優先）
+    progress_by_id = {
+        status.get("goalId"): status.get("progress", 0)
+        for status in reversed(current_goal_statuses)
+    }
+    
+    return orjson.dumps([{
+        "id": goal.get("id"),
+        "description": goal.get("description"),
+        "criteria": goal.get("criteria", []),
+        "isRequired": goal.get("isRequired", False),
+        "priority": goal.get("priority", 3),
+        "currentProgress": progress_by_id.get(goal.get("id"), 0)
+    } for goal in sorted(goals, key=lambda g: str(g.get("id", "")))], option=orjson.OPT_NON_STR_KEYS).decode()
 
-## 評価対象のゴール
-{goals_json}
 
-## 評価のポイント
-1. 各ゴールの進捗度を0-100%で評価してください
-2. 進捗度が100%に達した場合、ゴールは達成されたと判断します
-3. 不適切な発言や否定的な反応がある場合は、進捗度を下げるか現状維持してください
-4. ゴールの優先度や必須性を考慮して評価してください
-
-## 出力形式
-以下のJSON形式で回答してください：
-```json
-[
-  {{
-    "goalId": "<ゴールID>",
-    "progress": <0-100の整数値>,
-    "achieved": <trueまたはfalse>,
-    "reason": "<評価理由の簡潔な説明>"
-  }},
-  ...
-]
-```
-
-注意：必ずJSON形式のみで回答し、他の説明は含めないでください。
-"""
+def apply_goal_evaluations(
+    current_goal_statuses: List[Dict[str, Any]],
+    goal_evaluations: List[Dict[str, Any]],
+    now_ms: int = None
+) -> List[Dict[str, Any]]:
+    """
+    ゴール評価結果を現在のゴール達成状況に反映する
+    
+    Args:
+        current_goal_statuses (List[Dict[str, Any]]): 現在のゴール達成状況
+        goal_evaluations (List[Dict[str, Any]]): モデルによるゴール評価結果
+        now_ms (int, optional): 達成日時として記録する現在時刻（ミリ秒）
         
-        # Bedrockモデル呼び出し
-        response = invoke_bedrock_model(prompt)
+    Returns:
+        List[Dict[str, Any]]: 更新されたゴール達成状況
+    """
+    if now_ms is None:
+        now_ms = time.time_ns() // 1_000_000
+    
+    # 達成済みのゴールを含む更新後のゴールステータスリスト
+    updated_goal_statuses = current_goal_statuses.copy()
+    
+    # ゴールIDからステータスの位置を引けるようにしておく（同じIDが複数ある場合は先頭を更新）
+    index_by_id = {
+        status.get("goalId"): i
+        for i, status in reversed(list(enumerate(updated_goal_statuses)))
+    }
+    
+    for evaluated_goal in goal_evaluations:
+        goal_id = evaluated_goal.get("goalId")
+        i = index_by_id.get(goal_id)
+        if i is None:
+            continue
         
-        # 応答をパース
-        json_start = response.find('[') 
-        json_end = response.rfind(']') + 1
+        achieved = evaluated_goal.get("achieved", False)
         
-        if json_start >= 0 and json_end > json_start:
-            json_str = response[json_start:json_end]
-            goal_evaluations = json.loads(json_str)
-            
-            # 評価結果を整形
-            result = []
-            for eval_item in goal_evaluations:
-                goal_id = eval_item.get("goalId")
-                progress = max(0, min(100, int(eval_item.get("progress", 0))))
-                achieved = eval_item.get("achieved", False)
-                
-                result.append({
-                    "goalId": goal_id,
-                    "progress": progress,
-                    "achieved": achieved
-                })
-            
-            logger.info(f"ゴール評価結果: {json.dumps(result, ensure_ascii=False)}")
-            return result
-        else:
-            logger.warning(f"JSON形式の応答が見つかりません: {response}")
-            return current_goal_statuses
-    except Exception as e:
-        logger.error(f"Bedrockによるゴール評価エラー: {str(e)}")
-        return current_goal_statuses
+        # 達成状態を更新
+        updated_goal_statuses[i] = {
+            "goalId": goal_id,
+            "progress": evaluated_goal.get("progress", 0),
+            "achieved": achieved,
+            "achievedAt": now_ms if achieved else None
+        }
+    
+    return updated_goal_statuses
 
 def create_default_realtime_scores() -> Dict[str, Any]:
     """
@@ -567,5 +1159,6 @@ def create_default_realtime_scores() -> Dict[str, Any]:
         "angerLevel": 5,
         "trustLevel": 5,
         "progressLevel": 3,
-        "analysis": "スコア計算中にエラーが発生しました。デフォルト値を使用します。"
+        "analysis": "スコア計算中にエラーが発生しました。デフォルト値を使用します。",
+        "isDefault": True
     }
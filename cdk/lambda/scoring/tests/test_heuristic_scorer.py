@@ -0,0 +1,93 @@
+"""
+ヒューリスティックスコアラーのテスト
+
+Bedrock呼び出しを省略する条件が正しく判定されることを検証する:
+- あいさつ・相づちのみの短い発言のみをスコアに影響しない発言と判定する
+- 「はい」「yes」などの同意の発言は合意や承諾となり得るためモデルで評価する
+- 直前のスコアは保存済みのスコアがモデルの評価結果の場合のみ使用する
+"""
+from decimal import Decimal
+
+import pytest
+
+from heuristic_scorer import is_neutral_turn, select_prior_scores, MAX_NEUTRAL_LENGTH
+
+
+class TestIsNeutralTurn:
+    """発言がスコアに影響しないかの判定のテスト"""
+
+    @pytest.mark.parametrize("user_input", [
+        "こんにちは",
+        "なるほど！",
+        "  おはようございます  ",
+        "失礼します。",
+        "Hello",
+        "I see.",
+        "good morning!",
+    ])
+    def test_あいさつや相づちのみの発言はスコアに影響しない(self, user_input):
+        assert is_neutral_turn(user_input) is True
+
+    @pytest.mark.parametrize("user_input", [
+        "",
+        "   ",
+        "はい、価格について教えてください",
+        "こんにちは、本日は導入のご相談です",
+        "yes, but the price is too high",
+        "すみません",
+    ])
+    def test_空の発言や商談に関わる発言はモデルで評価する(self, user_input):
+        assert is_neutral_turn(user_input) is False
+
+    @pytest.mark.parametrize("user_input", [
+        "はい",
+        "はい。",
+        "ええ",
+        "うん",
+        "承知しました",
+        "かしこまりました",
+        "OK",
+        "okay!",
+        "Yes.",
+        "Sure",
+        "Got it",
+    ])
+    def test_同意や承諾の発言はモデルで評価する(self, user_input):
+        """価格への合意や次のステップの確認となり得るため省略しない"""
+        assert is_neutral_turn(user_input) is False
+
+    def test_あいさつで始まっても続きがある発言はモデルで評価する(self):
+        assert is_neutral_turn("こんにちは、御社のサービスについて") is False
+
+    def test_上限より長い発言はモデルで評価する(self):
+        user_input = "なるほど" + "。" * MAX_NEUTRAL_LENGTH
+        assert len(user_input) > MAX_NEUTRAL_LENGTH
+        assert is_neutral_turn(user_input) is False
+
+
+class TestSelectPriorScores:
+    """保存済みの直前のスコアのアイテムから使用するスコアを選択するテスト"""
+
+    def test_モデルの評価結果のスコアが使われる(self):
+        item = {"angerLevel": Decimal("1"), "trustLevel": Decimal("6"), "progressLevel": Decimal("5")}
+
+        prior = select_prior_scores(item)
+
+        assert prior == {"angerLevel": 1, "trustLevel": 6, "progressLevel": 5}
+        assert all(isinstance(value, int) for value in prior.values())
+
+    def test_デフォルト値のスコアは使用しない(self):
+        """デフォルト値（5/5/3）を直前のスコアとして繰り返さない"""
+        item = {"angerLevel": Decimal("5"), "trustLevel": Decimal("5"), "progressLevel": Decimal("3"),
+                "defaultScores": True}
+
+        assert select_prior_scores(item) is None
+
+    def test_メトリクスが欠けているアイテムは使用しない(self):
+        item = {"angerLevel": Decimal("1"), "trustLevel": Decimal("6")}
+
+        assert select_prior_scores(item) is None
+
+    @pytest.mark.parametrize("item", [None, {}])
+    def test_アイテムがない場合はNoneを返す(self, item):
+        assert select_prior_scores(item) is None
@@ -0,0 +1,95 @@
+"""
+ツール入力のストリーム読み取りのテスト
+
+tool_input_stream.py の read_tool_input_from_stream が以下を満たすことを検証する:
+- toolUseの入力断片を連結してJSONとして読み取る
+- ツール入力のブロックが閉じた時点で読み取りを終了し、後続のイベントを待たない
+- ツール呼び出しが無い場合は空の辞書を返す
+- 途中で終了した場合も含め、ストリームは必ず閉じられる
+"""
+import orjson
+import pytest
+
+from tool_input_stream import read_tool_input_from_stream
+
+
+def tool_input_event(fragment: str, index: int = 0) -> dict:
+    return {"contentBlockDelta": {"delta": {"toolUse": {"input": fragment}}, "contentBlockIndex": index}}
+
+
+def tool_start_event(index: int = 0) -> dict:
+    return {"contentBlockStart": {
+        "start": {"toolUse": {"toolUseId": "tooluse_1", "name": "evaluate_conversation"}},
+        "contentBlockIndex": index,
+    }}
+
+
+class TestReadToolInputFromStream:
+    """ツール入力のストリーム読み取りのテスト"""
+
+    def test_入力断片を連結して読み取る(self, event_stream):
+        stream = event_stream([
+            {"messageStart": {"role": "assistant"}},
+            tool_start_event(),
+            tool_input_event("{\"angerLevel\": 2, \"trustLe"),
+            tool_input_event("vel\": 6, \"progressLevel\": 4,"),
+            tool_input_event(" \"analysis\": \"信頼関係が深まっています\"}"),
+            {"contentBlockStop": {"contentBlockIndex": 0}},
+        ])
+
+        assert read_tool_input_from_stream(stream) == {
+            "angerLevel": 2,
+            "trustLevel": 6,
+            "progressLevel": 4,
+            "analysis": "信頼関係が深まっています",
+        }
+        assert stream.closed is True
+
+    def test_ツール入力のブロックが閉じた時点で読み取りを終了する(self, event_stream):
+        stream = event_stream([
+            tool_start_event(),
+            tool_input_event("{\"angerLevel\": 1}"),
+            {"contentBlockStop": {"contentBlockIndex": 0}},
+            {"messageStop": {"stopReason": "tool_use"}},
+            {"metadata": {"usage": {"inputTokens": 100, "outputTokens": 20}}},
+        ])
+
+        assert read_tool_input_from_stream(stream) == {"angerLevel": 1}
+        assert stream.consumed == 3
+        assert stream.closed is True
+
+    def test_ツール入力より前のテキストブロックの終端では終了しない(self, event_stream):
+        stream = event_stream([
+            {"contentBlockDelta": {"delta": {"text": "評価します。"}, "contentBlockIndex": 0}},
+            {"contentBlockStop": {"contentBlockIndex": 0}},
+            tool_start_event(index=1),
+            tool_input_event("{\"trustLevel\": 7}", index=1),
+            {"contentBlockStop": {"contentBlockIndex": 1}},
+        ])
+
+        assert read_tool_input_from_stream(stream) == {"trustLevel": 7}
+
+    def test_ツール呼び出しが無い場合は空の辞書を返す(self, event_stream):
+        stream = event_stream([
+            {"contentBlockDelta": {"delta": {"text": "評価できませんでした"}, "contentBlockIndex": 0}},
+            {"contentBlockStop": {"contentBlockIndex": 0}},
+            {"messageStop": {"stopReason": "end_turn"}},
+        ])
+
+        assert read_tool_input_from_stream(stream) == {}
+        assert stream.closed is True
+
+    def test_不完全なツール入力はJSONDecodeErrorになる(self, event_stream):
+        # 呼び出し側は例外を捕捉してデフォルトのスコアに置き換える
+        stream = event_stream([tool_input_event("{\"angerLevel\": ")])
+
+        with pytest.raises(orjson.JSONDecodeError):
+            read_tool_input_from_stream(stream)
+        assert stream.closed is True
+
+    def test_読み取り中に例外が発生してもストリームを閉じる(self, broken_event_stream):
+        stream = broken_event_stream([tool_input_event("{\"angerLevel\":")])
+
+        with pytest.raises(RuntimeError):
+            read_tool_input_from_stream(stream)
+        assert stream.closed is True
@@ -0,0 +1,41 @@
+"""
+ツール入力のストリーム読み取りモジュール
+
+converse_streamのイベントストリームから、ツール呼び出しの入力JSONを読み取ります。
+
+Functions:
+    read_tool_input_from_stream: イベントストリームからツールの入力を読み取る
+"""
+
+import orjson
+from typing import Dict, Any
+
+
+def read_tool_input_from_stream(event_stream) -> Dict[str, Any]:
+    """
+    converse_streamのイベントストリームからツールの入力を読み取る
+
+    ツール入力のJSON断片を連結し、そのコンテンツブロックが閉じた時点で
+    ストリームを閉じて残りのイベントを読み捨てます。
+
+    Args:
+        event_stream: converse_stream応答の "stream"
+
+    Returns:
+        Dict[str, Any]: ツールの入力（ツール呼び出しが無い場合は空の辞書）
+    """
+    chunks = []
+
+    try:
+        for event in event_stream:
+            if "contentBlockDelta" in event:
+                tool_use = event["contentBlockDelta"].get("delta", {}).get("toolUse")
+                if tool_use:
+                    chunks.append(tool_use.get("input", ""))
+            elif "contentBlockStop" in event and chunks:
+                # ツール入力のブロックが閉じたので以降のイベントは不要
+                break
+    finally:
+        event_stream.close()
+
+    return orjson.loads("".join(chunks)) if chunks else {}
@@ -0,0 +1,55 @@
+"""
+分析ステータス共通モジュール
+
+分析ステータスアイテム（dataType: analysis-status）は1回の分析実行につき1件とし、
+APIで作成したキー（createdAt）をStep Functionsの入力（statusCreatedAt）で各ステップに引き継ぎます。
+"""
+
+import time
+from typing import Any
+
+# ステータスアイテムの保持期間（24時間後に削除）
+ANALYSIS_STATUS_TTL_SECONDS = 24 * 60 * 60
+
+
+def status_timestamp() -> str:
+    """ステータスアイテムのcreatedAt/updatedAtに使用するタイムスタンプ（ISO形式）"""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def update_analysis_status_item(
+    feedback_table: Any,
+    session_id: str,
+    created_at: str,
+    status: str,
+    error_message: str = None
+):
+    """
+    分析ステータスアイテムのステータス関連の属性のみを更新する
+
+    executionArnなど既存の属性は保持し、アイテムが存在しなければ新規作成する。
+    """
+    update_expr = (
+        "SET #status = :status, updatedAt = :updated, dataType = :dataType, "
+        "expireAt = if_not_exists(expireAt, :expireAt)"
+    )
+    expr_values = {
+        ":status": status,
+        ":updated": status_timestamp(),
+        ":dataType": "analysis-status",
+        ":expireAt": int(time.time()) + ANALYSIS_STATUS_TTL_SECONDS
+    }
+
+    if error_message:
+        update_expr += ", errorMessage = :error"
+        expr_values[":error"] = error_message
+
+    feedback_table.update_item(
+        Key={
+            "sessionId": session_id,
+            "createdAt": created_at
+        },
+        UpdateExpression=update_expr,
+        ExpressionAttributeValues=expr_values,
+        ExpressionAttributeNames={"#status": "status"}
+    )
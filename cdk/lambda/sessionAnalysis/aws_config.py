@@ -0,0 +1,15 @@
+"""
+AWSクライアント共通設定モジュール
+
+セッション分析の各Lambda関数で使用するboto3クライアントの接続設定を共有します。
+各Lambdaは必要なクライアントのみをモジュールレベルで生成し、ウォームインスタンス間で再利用します。
+"""
+
+from botocore.config import Config
+
+# 共通のクライアント設定（接続プールの拡張、アダプティブリトライ、TCPキープアライブ）
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    tcp_keepalive=True
+)
@@ -7,6 +7,7 @@ Strands Agentsのstructured outputを使用してセッションの詳細フィ
 import os
 import time
 import random
+import boto3
 from strands import Agent
 from strands.models import BedrockModel
 from aws_lambda_powertools import Logger
@@ -14,6 +15,7 @@ from typing import Dict, Any, List
 from decimal import Decimal
 from botocore.config import Config as BotocoreConfig
 
+from aws_config import BOTO_CONFIG
 from feedback_types import FeedbackOutput
 from prompts import build_feedback_prompt, get_structured_output_prompt, create_default_feedback
 
@@ -43,6 +45,15 @@ bedrock_model = BedrockModel(
 
 # AgentCore Memory設定
 AGENTCORE_MEMORY_ID = os.environ.get("AGENTCORE_MEMORY_ID", "")
+agentcore_client = None
+
+
+def get_agentcore_client():
+    """AgentCore クライアントを取得（遅延初期化）"""
+    global agentcore_client
+    if agentcore_client is None:
+        agentcore_client = boto3.client('bedrock-agentcore', region_name=REGION, config=BOTO_CONFIG)
+    return agentcore_client
 
 
 def _get_slide_history_from_memory(session_id: str) -> List[Dict[str, Any]]:
@@ -51,8 +62,7 @@ def _get_slide_history_from_memory(session_id: str) -> List[Dict[str, Any]]:
         return []
     
     try:
-        import boto3
-        client = boto3.client('bedrock-agentcore', region_name=REGION)
+        client = get_agentcore_client()
         
         # メタデータフィルタでslide_presentationイベントのみ取得
         response = client.list_events(
@@ -15,6 +15,9 @@ from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from typing import Dict, Any
 
+from aws_config import BOTO_CONFIG
+from analysis_status import ANALYSIS_STATUS_TTL_SECONDS, status_timestamp
+
 # ロガー設定
 logger = Logger(service="session-analysis-api")
 
@@ -24,8 +27,8 @@ SESSIONS_TABLE = os.environ.get("SESSIONS_TABLE")
 STATE_MACHINE_ARN = os.environ.get("SESSION_ANALYSIS_STATE_MACHINE_ARN")
 
 # AWSクライアント
-dynamodb = boto3.resource("dynamodb")
-sfn = boto3.client("stepfunctions")
+dynamodb = boto3.resource("dynamodb", config=BOTO_CONFIG)
+sfn = boto3.client("stepfunctions", config=BOTO_CONFIG)
 
 # CORS設定
 cors_config = CORSConfig(
@@ -100,6 +103,8 @@ def start_analysis(session_id: str):
         
         # Step Functions実行
         execution_name = f"session-{session_id}-{int(time.time())}"
+        # この実行の分析ステータスアイテムのキー（各ステップは同じアイテムを更新する）
+        status_created_at = status_timestamp()
         
         sfn_response = sfn.start_execution(
             stateMachineArn=STATE_MACHINE_ARN,
@@ -108,14 +113,15 @@ def start_analysis(session_id: str):
                 "sessionId": session_id,
                 "userId": user_id,
                 "language": language,
-                "realtimeGoalStatuses": goal_statuses
+                "realtimeGoalStatuses": goal_statuses,
+                "statusCreatedAt": status_created_at
             })
         )
         
         execution_arn = sfn_response["executionArn"]
         
         # 実行ARNを保存
-        save_execution_arn(session_id, execution_arn)
+        save_execution_arn(session_id, execution_arn, status_created_at)
         
         logger.info("Step Functions実行開始", extra={
             "session_id": session_id,
@@ -232,38 +238,56 @@ def get_analysis_status(session_id: str) -> Dict[str, Any]:
     try:
         feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
         
+        # sessionId + dataTypeのGSIでステータスアイテムのみを取得
+        # （FilterExpressionはLimit適用後に評価されるため、他のアイテムが新しいと見つからない）
         response = feedback_table.query(
-            KeyConditionExpression=boto3.dynamodb.conditions.Key("sessionId").eq(session_id),
-            FilterExpression=boto3.dynamodb.conditions.Attr("dataType").eq("analysis-status"),
-            ScanIndexForward=False,
-            Limit=1
+            IndexName="sessionId-dataType-index",
+            KeyConditionExpression=(
+                boto3.dynamodb.conditions.Key("sessionId").eq(session_id)
+                & boto3.dynamodb.conditions.Key("dataType").eq("analysis-status")
+            )
         )
         
         items = response.get("Items", [])
-        return items[0] if items else None
+        # GSI内ではcreatedAt順に並ばないため、最新のものを選択
+        return max(items, key=lambda item: item.get("createdAt", "")) if items else None
         
     except Exception as e:
         logger.error(f"ステータス取得エラー: {str(e)}")
         return None
 
 
-def save_execution_arn(session_id: str, execution_arn: str):
-    """実行ARNをDynamoDBに保存"""
+def save_execution_arn(session_id: str, execution_arn: str, status_created_at: str):
+    """
+    実行ARNをDynamoDBに保存
+    
+    開始ステップが先にステータスを更新している場合があるため、
+    statusは未設定の場合のみ「処理中」とし、既存のステータスは上書きしない。
+    """
     try:
         feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
-        current_time = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        current_time = status_timestamp()
         
-        item = {
-            "sessionId": session_id,
-            "createdAt": current_time,
-            "dataType": "analysis-status",
-            "status": "processing",
-            "executionArn": execution_arn,
-            "updatedAt": current_time,
-            "expireAt": int(time.time()) + (24 * 60 * 60)
-        }
-        
-        feedback_table.put_item(Item=item)
+        feedback_table.update_item(
+            Key={
+                "sessionId": session_id,
+                "createdAt": status_created_at
+            },
+            UpdateExpression=(
+                "SET executionArn = :executionArn, dataType = :dataType, "
+                "#status = if_not_exists(#status, :status), "
+                "updatedAt = if_not_exists(updatedAt, :updated), "
+                "expireAt = if_not_exists(expireAt, :expireAt)"
+            ),
+            ExpressionAttributeValues={
+                ":executionArn": execution_arn,
+                ":dataType": "analysis-status",
+                ":status": "processing",
+                ":updated": current_time,
+                ":expireAt": int(time.time()) + ANALYSIS_STATUS_TTL_SECONDS
+            },
+            ExpressionAttributeNames={"#status": "status"}
+        )
         
     except Exception as e:
         logger.error(f"実行ARN保存エラー: {str(e)}")
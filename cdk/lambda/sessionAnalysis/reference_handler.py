@@ -15,6 +15,8 @@ from typing import Dict, Any, List, Optional
 from strands import Agent
 from strands.models import BedrockModel
 
+from aws_config import BOTO_CONFIG
+
 # ロガー設定
 logger = Logger(service="session-analysis-reference")
 
@@ -30,7 +32,7 @@ logger.info("Lambda初期化", extra={
 })
 
 # Bedrockクライアント（Knowledge Base用のみ）
-bedrock_agent_runtime = boto3.client("bedrock-agent-runtime")
+bedrock_agent_runtime = boto3.client("bedrock-agent-runtime", config=BOTO_CONFIG)
 
 
 def extract_metadata_scenario_id(scenario_info: Optional[Dict[str, Any]]) -> Optional[str]:
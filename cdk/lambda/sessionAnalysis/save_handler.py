@@ -6,14 +6,15 @@
 
 import os
 import time
-import json
-import datetime
 import boto3
-import boto3.dynamodb.conditions
+import orjson
 from aws_lambda_powertools import Logger
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
+from aws_config import BOTO_CONFIG
+from analysis_status import status_timestamp, update_analysis_status_item
+
 # ロガー設定
 logger = Logger(service="session-analysis-save")
 
@@ -21,7 +22,7 @@ logger = Logger(service="session-analysis-save")
 SESSION_FEEDBACK_TABLE = os.environ.get("SESSION_FEEDBACK_TABLE")
 
 # DynamoDBクライアント
-dynamodb = boto3.resource("dynamodb")
+dynamodb = boto3.resource("dynamodb", config=BOTO_CONFIG)
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -52,6 +53,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         scenario_goals = feedback_result.get("scenarioGoals", [])
         realtime_goal_statuses = feedback_result.get("realtimeGoalStatuses", [])
         language = feedback_result.get("language", "ja")
+        # APIで作成したステータスアイテムのキー（開始ステップから引き継がれる）
+        status_created_at = feedback_result.get("statusCreatedAt")
         
         logger.info("結果保存開始", extra={
             "session_id": session_id,
@@ -89,7 +92,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
         
         # 分析ステータスを「完了」に更新
-        update_analysis_status(session_id, "completed")
+        update_analysis_status(session_id, "completed", created_at=status_created_at)
         
         logger.info("結果保存完了", extra={
             "session_id": session_id,
@@ -110,9 +113,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.exception("結果保存エラー", extra={"error": str(e)})
         
         # エラー時もステータスを更新
-        session_id = event.get("feedbackResult", {}).get("sessionId")
+        feedback_result = event.get("feedbackResult", {})
+        session_id = feedback_result.get("sessionId")
         if session_id:
-            update_analysis_status(session_id, "failed", str(e))
+            update_analysis_status(session_id, "failed", str(e), feedback_result.get("statusCreatedAt"))
         
         raise
 
@@ -133,7 +137,8 @@ def save_to_dynamodb(
     feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
     # ミリ秒を含むタイムスタンプを使用して、同一秒内の衝突を防ぐ
     # final-feedback用のサフィックスを追加してupdate_analysis_statusとの衝突を回避
-    current_time = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z-feedback"
+    now = time.time()
+    current_time = f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{int(now * 1000) % 1000:03d}Z-feedback"
     
     # TTL設定（180日後に削除）
     expire_at = int(time.time()) + (180 * 24 * 60 * 60)
@@ -163,7 +168,8 @@ def save_to_dynamodb(
     
     # 動画分析結果
     if video_analysis:
-        item["videoAnalysis"] = convert_to_dynamodb(video_analysis)
+        # ネストしたdictを属性型へ変換せず、JSON文字列1つとして保存（読み取り側でデコード）
+        item["videoAnalysisJson"] = orjson.dumps(video_analysis).decode()
         item["videoAnalysisCreatedAt"] = current_time
     
     if video_url:
@@ -185,59 +191,42 @@ def save_to_dynamodb(
     })
 
 
-def update_analysis_status(session_id: str, status: str, error_message: str = None):
-    """分析ステータスを更新"""
+def find_analysis_status_created_at(session_id: str) -> Optional[str]:
+    """最新の分析ステータスアイテムのcreatedAtを取得（存在しなければNone）"""
+    feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
+    
+    # sessionId + dataTypeのGSIでステータスアイテムのみを検索
+    # （FilterExpressionはLimit適用後に評価されるため、ステータス以外のアイテムが新しいと見つからない）
+    response = feedback_table.query(
+        IndexName="sessionId-dataType-index",
+        KeyConditionExpression="sessionId = :sessionId AND dataType = :dataType",
+        ExpressionAttributeValues={":sessionId": session_id, ":dataType": "analysis-status"},
+        ProjectionExpression="createdAt"  # キーの特定にはcreatedAtのみ必要
+    )
+    
+    items = response.get("Items", [])
+    # GSI内ではcreatedAt順に並ばないため、最新のものを選択
+    return max(item["createdAt"] for item in items) if items else None
+
+
+def update_analysis_status(
+    session_id: str,
+    status: str,
+    error_message: str = None,
+    created_at: Optional[str] = None
+):
+    """分析ステータスを更新
+
+    created_at（APIで作成したステータスアイテムのキー）が渡された場合は既存アイテムの検索を省略する。
+    """
     try:
         feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
-        current_time = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        
-        # 既存のステータスアイテムを検索
-        response = feedback_table.query(
-            KeyConditionExpression=boto3.dynamodb.conditions.Key("sessionId").eq(session_id),
-            FilterExpression=boto3.dynamodb.conditions.Attr("dataType").eq("analysis-status"),
-            ScanIndexForward=False,
-            Limit=1
-        )
         
-        items = response.get("Items", [])
+        if not created_at:
+            # statusCreatedAtを持たない実行（デプロイ前に開始した実行など）は最新のステータスアイテムを更新
+            created_at = find_analysis_status_created_at(session_id) or status_timestamp()
         
-        if items:
-            # 既存アイテムを更新
-            item = items[0]
-            update_expr = "SET #status = :status, updatedAt = :updated"
-            expr_values = {
-                ":status": status,
-                ":updated": current_time
-            }
-            expr_names = {"#status": "status"}
-            
-            if error_message:
-                update_expr += ", errorMessage = :error"
-                expr_values[":error"] = error_message
-            
-            feedback_table.update_item(
-                Key={
-                    "sessionId": session_id,
-                    "createdAt": item["createdAt"]
-                },
-                UpdateExpression=update_expr,
-                ExpressionAttributeValues=expr_values,
-                ExpressionAttributeNames=expr_names
-            )
-        else:
-            # 新規作成
-            item = {
-                "sessionId": session_id,
-                "createdAt": current_time,
-                "dataType": "analysis-status",
-                "status": status,
-                "updatedAt": current_time,
-                "expireAt": int(time.time()) + (24 * 60 * 60)
-            }
-            if error_message:
-                item["errorMessage"] = error_message
-            
-            feedback_table.put_item(Item=item)
+        update_analysis_status_item(feedback_table, session_id, created_at, status, error_message)
         
         logger.debug(f"分析ステータス更新: {status}")
         
@@ -12,11 +12,15 @@ import time
 import json
 import boto3
 import boto3.dynamodb.conditions
+from concurrent.futures import ThreadPoolExecutor
 from aws_lambda_powertools import Logger
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 
+from aws_config import BOTO_CONFIG
+from analysis_status import status_timestamp, update_analysis_status_item
+
 # ロガー設定
 logger = Logger(service="session-analysis-start")
 
@@ -30,10 +34,13 @@ AGENTCORE_MEMORY_ID = os.environ.get("AGENTCORE_MEMORY_ID", "")
 AWS_REGION = os.environ.get("AWS_REGION", "us-west-2")
 
 # AWSクライアント
-dynamodb = boto3.resource("dynamodb")
-s3 = boto3.client("s3")
+dynamodb = boto3.resource("dynamodb", config=BOTO_CONFIG)
+s3 = boto3.client("s3", config=BOTO_CONFIG)
 agentcore_client = None
 
+# セッションデータ収集の並列実行用スレッドプール（boto3クライアントはスレッドセーフ）
+executor = ThreadPoolExecutor(max_workers=4)
+
 def json_serializable(obj):
     """
     オブジェクトをJSONシリアライズ可能な形式に変換する
@@ -59,7 +66,7 @@ def get_agentcore_client():
     """AgentCore クライアントを取得（遅延初期化）"""
     global agentcore_client
     if agentcore_client is None:
-        agentcore_client = boto3.client("bedrock-agentcore", region_name=AWS_REGION)
+        agentcore_client = boto3.client("bedrock-agentcore", region_name=AWS_REGION, config=BOTO_CONFIG)
     return agentcore_client
 
 
@@ -72,6 +79,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             - sessionId: セッションID
             - userId: ユーザーID
             - language: 言語設定 (ja/en)
+            - statusCreatedAt: APIで作成した分析ステータスアイテムのキー
             
     Returns:
         分析に必要なセッションデータ
@@ -81,6 +89,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         user_id = event.get("userId")
         language = event.get("language", "ja")
         realtime_goal_statuses = event.get("realtimeGoalStatuses", [])
+        # 分析ステータスアイテムのキー（API以外から開始された場合は新しいアイテムを作成）
+        status_created_at = event.get("statusCreatedAt") or status_timestamp()
         
         logger.info("セッション分析開始", extra={
             "session_id": session_id,
@@ -91,8 +101,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not session_id or not user_id:
             raise ValueError("sessionIdとuserIdは必須です")
         
-        # 分析ステータスを「処理中」に更新
-        update_analysis_status(session_id, "processing")
+        # 分析ステータスを「処理中」に更新（キーは後続ステップへ引き継ぐ）
+        update_analysis_status(session_id, "processing", created_at=status_created_at)
+        
+        # セッション情報に依存しない取得処理は並行して開始
+        # メッセージ履歴（user_idをactor_idとして渡す）、リアルタイムメトリクス、動画ファイルの存在確認
+        messages_future = executor.submit(get_messages, session_id, user_id)
+        metrics_future = executor.submit(get_realtime_metrics, session_id)
+        video_future = executor.submit(find_session_video, session_id)
         
         # セッション情報を取得
         session_info = get_session_info(session_id, user_id)
@@ -105,17 +121,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         scenario_info = get_scenario_info(scenario_id) if scenario_id else None
         scenario_goals = scenario_info.get("goals", []) if scenario_info else []
         
-        # メッセージ履歴を取得（user_idをactor_idとして渡す）
-        messages = get_messages(session_id, user_id)
-        
-        # リアルタイムメトリクスを取得
-        realtime_metrics = get_realtime_metrics(session_id)
+        # 並行して取得した結果を回収
+        messages = messages_future.result()
+        realtime_metrics = metrics_future.result()
+        video_key, video_size = video_future.result()
         
         # 最終メトリクスを計算
         final_metrics = calculate_final_metrics(realtime_metrics)
         
-        # 動画ファイルの存在確認
-        video_key = find_session_video(session_id)
         has_video = video_key is not None
         
         # Knowledge Baseの有無を確認（pdfFilesがあればKnowledge Baseが使用可能）
@@ -153,7 +166,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "finalMetrics": final_metrics,
             "hasVideo": has_video,
             "videoKey": video_key,
+            "videoSize": video_size,
             "hasKnowledgeBase": has_knowledge_base,
+            "statusCreatedAt": status_created_at,
             "startTime": int(time.time() * 1000)
         })
         
@@ -161,29 +176,22 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.exception("セッション分析開始エラー", extra={"error": str(e)})
         # エラー時もステータスを更新
         if "session_id" in dir():
-            update_analysis_status(session_id, "failed", str(e))
+            update_analysis_status(session_id, "failed", str(e), created_at=status_created_at)
         raise
 
 
-def update_analysis_status(session_id: str, status: str, error_message: str = None):
-    """分析ステータスをDynamoDBに保存"""
+def update_analysis_status(
+    session_id: str,
+    status: str,
+    error_message: str = None,
+    created_at: Optional[str] = None
+):
+    """分析ステータスをDynamoDBに保存（executionArnなど既存の属性は保持）"""
     try:
         feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
-        current_time = f"{int(time.time() * 1000)}"
-        
-        item = {
-            "sessionId": session_id,
-            "createdAt": current_time,
-            "dataType": "analysis-status",
-            "status": status,
-            "updatedAt": current_time,
-            "expireAt": int(time.time()) + (24 * 60 * 60)  # 24時間後に削除
-        }
-        
-        if error_message:
-            item["errorMessage"] = error_message
-            
-        feedback_table.put_item(Item=item)
+        update_analysis_status_item(
+            feedback_table, session_id, created_at or status_timestamp(), status, error_message
+        )
         logger.debug(f"分析ステータス更新: {status}")
         
     except Exception as e:
@@ -377,16 +385,24 @@ def get_messages_from_agentcore_memory(session_id: str, actor_id: str = "default
 
 
 def get_realtime_metrics(session_id: str) -> list:
-    """リアルタイムメトリクスを取得"""
+    """リアルタイムメトリクスを取得（新しい順）"""
     feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
     
+    # sessionId + dataTypeのGSIでメトリクスのみを取得し、最終メトリクスの計算に使う属性だけを読み取る
+    # （Step Functionsの状態データにも含まれるため、ペイロードサイズの削減にもなる）
     response = feedback_table.query(
-        KeyConditionExpression=boto3.dynamodb.conditions.Key("sessionId").eq(session_id),
-        FilterExpression=boto3.dynamodb.conditions.Attr("dataType").eq("realtime-metrics"),
-        ScanIndexForward=False
+        IndexName="sessionId-dataType-index",
+        KeyConditionExpression=(
+            boto3.dynamodb.conditions.Key("sessionId").eq(session_id)
+            & boto3.dynamodb.conditions.Key("dataType").eq("realtime-metrics")
+        ),
+        ProjectionExpression="createdAt, messageNumber, angerLevel, trustLevel, progressLevel, analysis"
     )
     
-    return response.get("Items", [])
+    # GSI内ではcreatedAt順に並ばないため、新しい順に並べ替える
+    items = response.get("Items", [])
+    items.sort(key=lambda item: item.get("createdAt", ""), reverse=True)
+    return items
 
 
 def calculate_final_metrics(realtime_metrics: list) -> Dict[str, Any]:
@@ -410,13 +426,16 @@ def calculate_final_metrics(realtime_metrics: list) -> Dict[str, Any]:
     }
 
 
-def find_session_video(session_id: str) -> str:
-    """セッションの動画ファイルを検索"""
+def find_session_video(session_id: str) -> Tuple[Optional[str], Optional[int]]:
+    """セッションの動画ファイルを検索し、(キー, サイズ)を返す
+
+    サイズはlist_objects_v2の結果から取得し、動画分析ステップでのサイズ判定に使用する。
+    """
     logger.info(f"VIDEO_BUCKET環境変数: {VIDEO_BUCKET}")
     
     if not VIDEO_BUCKET:
         logger.warning("VIDEO_BUCKET環境変数が設定されていません")
-        return None
+        return None, None
         
     try:
         prefix = f"videos/{session_id}/"
@@ -437,12 +456,12 @@ def find_session_video(session_id: str) -> str:
         
         if not contents:
             logger.info(f"動画ファイルが見つかりません: prefix={prefix}")
-            return None
+            return None, None
         
         # 最新の動画ファイルを返す
         video_files = [
             obj for obj in contents 
-            if obj["Key"].endswith(".mp4") or obj["Key"].endswith(".webm")
+            if obj["Key"].lower().endswith((".mp4", ".webm"))
         ]
         
         logger.info(f"動画ファイル数: {len(video_files)}件")
@@ -451,11 +470,11 @@ def find_session_video(session_id: str) -> str:
             # 最新のファイルを選択
             latest = max(video_files, key=lambda x: x["LastModified"])
             logger.info(f"最新の動画ファイル: {latest['Key']}")
-            return latest["Key"]
+            return latest["Key"], latest["Size"]
             
         logger.info("mp4/webmファイルが見つかりません")
-        return None
+        return None, None
         
     except Exception as e:
         logger.exception(f"動画ファイル検索エラー: {str(e)}")
-        return None
+        return None, None
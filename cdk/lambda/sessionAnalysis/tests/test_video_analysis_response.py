@@ -0,0 +1,59 @@
+"""
+動画分析のモデル出力解析のテスト
+
+video_response.py の extract_json_object が以下を満たすことを検証する:
+- コードフェンスで囲まれたJSONを取り出せる
+- JSONの後ろに説明文が続く場合も最初のJSONオブジェクトのみを取り出す
+- JSONが無い・壊れている場合は例外になる（呼び出し側でデフォルト値に置き換える）
+"""
+import json
+
+import pytest
+
+from video_response import extract_json_object
+
+
+ANALYSIS = {
+    "overallScore": 7,
+    "eyeContact": 6,
+    "facialExpression": 8,
+    "gesture": 7,
+    "emotion": 7,
+    "strengths": ["笑顔で話している"],
+    "improvements": ["視線が下がりがち"],
+    "analysis": "全体的に落ち着いた印象です",
+}
+
+
+class TestExtractJsonObject:
+    """モデル出力から最初のJSONオブジェクトを取り出すテスト"""
+
+    def test_JSONのみの出力(self):
+        assert extract_json_object(json.dumps(ANALYSIS, ensure_ascii=False)) == ANALYSIS
+
+    def test_コードフェンスで囲まれた出力(self):
+        response_text = f"```json\n{json.dumps(ANALYSIS, ensure_ascii=False)}\n```\n"
+
+        assert extract_json_object(response_text) == ANALYSIS
+
+    def test_JSONの後ろに説明文が続く出力(self):
+        response_text = (
+            f"```json\n{json.dumps(ANALYSIS, ensure_ascii=False)}\n```\n"
+            "以上が分析結果です。{補足}があれば追記します。"
+        )
+
+        assert extract_json_object(response_text) == ANALYSIS
+
+    def test_文字列内の波括弧で打ち切られない(self):
+        analysis = {"overallScore": 5, "analysis": "「}」を含む説明 {例}"}
+
+        assert extract_json_object(f"結果: {json.dumps(analysis, ensure_ascii=False)} 以上") == analysis
+
+    def test_JSONが無い出力はValueErrorになる(self):
+        with pytest.raises(ValueError):
+            extract_json_object("分析できませんでした")
+
+    def test_壊れたJSONはJSONDecodeErrorになる(self):
+        # 呼び出し側はjson.JSONDecodeErrorを捕捉してデフォルトの分析結果に置き換える
+        with pytest.raises(json.JSONDecodeError):
+            extract_json_object('```json\n{"overallScore": 7, "analysis": \n```')
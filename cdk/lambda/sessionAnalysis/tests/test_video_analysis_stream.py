@@ -0,0 +1,85 @@
+"""
+動画分析のストリーム読み取りのテスト
+
+video_response.py の read_video_analysis_stream が以下を満たすことを検証する:
+- JSONオブジェクトが閉じた時点で読み取りを終了し、後続のイベントを待たない
+- 文字列内の波括弧ではJSONが完結したと判定しない
+- 途中で終了した場合も含め、ストリームは必ず閉じられる
+"""
+import json
+
+import pytest
+
+from video_response import read_video_analysis_stream
+
+
+def text_event(text: str) -> dict:
+    return {"contentBlockDelta": {"delta": {"text": text}, "contentBlockIndex": 0}}
+
+
+class TestReadVideoAnalysisStream:
+    """動画分析のストリーム読み取りのテスト"""
+
+    def test_JSONが閉じた時点で読み取りを終了する(self, event_stream):
+        stream = event_stream([
+            {"messageStart": {"role": "assistant"}},
+            text_event("```json\n{\"overallScore\": 7,"),
+            text_event(" \"analysis\": \"良好\"}"),
+            text_event("\n```\n以上が分析結果です。"),
+            {"contentBlockStop": {"contentBlockIndex": 0}},
+            {"messageStop": {"stopReason": "end_turn"}},
+        ])
+
+        response_text = read_video_analysis_stream(stream)
+
+        assert response_text == "```json\n{\"overallScore\": 7, \"analysis\": \"良好\"}"
+        assert stream.consumed == 3
+        assert stream.closed is True
+
+    def test_文字列内の波括弧では終了しない(self, event_stream):
+        stream = event_stream([
+            text_event("{\"analysis\": \"「}」を含む"),
+            text_event("説明\", \"overallScore\": 5}"),
+            text_event("以上"),
+        ])
+
+        response_text = read_video_analysis_stream(stream)
+
+        assert json.loads(response_text) == {"analysis": "「}」を含む説明", "overallScore": 5}
+        assert stream.consumed == 2
+
+    def test_ネストしたオブジェクトは外側が閉じるまで読み取る(self, event_stream):
+        stream = event_stream([
+            text_event("{\"scores\": {\"eyeContact\": 6}"),
+            text_event(", \"overallScore\": 7}"),
+        ])
+
+        response_text = read_video_analysis_stream(stream)
+
+        assert json.loads(response_text) == {"scores": {"eyeContact": 6}, "overallScore": 7}
+
+    def test_JSONを含まない場合は全テキストを返す(self, event_stream):
+        stream = event_stream([
+            text_event("分析できませんでした。"),
+            text_event("動画が短すぎます}"),
+            {"messageStop": {"stopReason": "end_turn"}},
+        ])
+
+        assert read_video_analysis_stream(stream) == "分析できませんでした。動画が短すぎます}"
+        assert stream.closed is True
+
+    def test_テキスト以外のイベントは無視する(self, event_stream):
+        stream = event_stream([
+            {"messageStart": {"role": "assistant"}},
+            {"contentBlockDelta": {"delta": {}, "contentBlockIndex": 0}},
+            {"metadata": {"usage": {"inputTokens": 10, "outputTokens": 5}}},
+        ])
+
+        assert read_video_analysis_stream(stream) == ""
+
+    def test_読み取り中に例外が発生してもストリームを閉じる(self, broken_event_stream):
+        stream = broken_event_stream([text_event("{\"overallScore\":")])
+
+        with pytest.raises(RuntimeError):
+            read_video_analysis_stream(stream)
+        assert stream.closed is True
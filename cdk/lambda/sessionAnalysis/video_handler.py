@@ -8,10 +8,15 @@ Cross-region inference profileを使用して、S3バケットと同じリージ
 import os
 import json
 import boto3
-from botocore.config import Config
+from botocore.exceptions import ClientError
 from aws_lambda_powertools import Logger
 from typing import Dict, Any, Optional
 
+from aws_config import BOTO_CONFIG
+
+# モデル出力のストリーム読み取りとJSONオブジェクトの取り出し
+from video_response import extract_json_object, read_video_analysis_stream
+
 # ロガー設定
 logger = Logger(service="session-analysis-video")
 
@@ -21,16 +26,23 @@ VIDEO_BUCKET = os.environ.get("VIDEO_BUCKET")
 # これにより、Lambdaと同じリージョンでBedrockを呼び出しつつ、
 # 実際の推論は利用可能なリージョンで実行される
 VIDEO_ANALYSIS_MODEL_ID = os.environ.get("VIDEO_ANALYSIS_MODEL_ID", "global.amazon.nova-2-lite-v1:0")
+# レイテンシ最適化推論を使用するか（対応していないモデルでは自動的に標準推論にフォールバック）
+BEDROCK_LATENCY_OPTIMIZED = os.environ.get("BEDROCK_LATENCY_OPTIMIZED", "0") == "1"
+LATENCY_OPTIMIZED_PERFORMANCE_CONFIG = {"latency": "optimized"}
+# Bedrockが扱えるS3動画の上限サイズ（超える場合は分析をスキップ）
+MAX_VIDEO_SIZE_BYTES = 1024 * 1024 * 1024  # 1GB
+# 動画分析の推論設定（固定値のため初期化時に一度だけ定義）
+VIDEO_ANALYSIS_INFERENCE_CONFIG = {"maxTokens": 4096, "temperature": 0.3}
 
 # Bedrockクライアント（Lambdaと同じリージョンで作成）
 # Cross-region inference profileを使用するため、S3と同じリージョンで呼び出す
-bedrock_runtime = boto3.client(
-    "bedrock-runtime",
-    config=Config(retries={"max_attempts": 3})
-)
+bedrock_runtime = boto3.client("bedrock-runtime", config=BOTO_CONFIG)
 
 # S3クライアント
-s3 = boto3.client("s3")
+s3 = boto3.client("s3", config=BOTO_CONFIG)
+
+# レイテンシ最適化推論がモデルで利用可能か（ValidationExceptionを受けたら以降は使用しない）
+latency_optimized_available = BEDROCK_LATENCY_OPTIMIZED
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -47,12 +59,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         session_id = event.get("sessionId")
         has_video = event.get("hasVideo", False)
         video_key = event.get("videoKey")
+        video_size = event.get("videoSize")
         language = event.get("language", "ja")
         
         logger.info("動画分析開始", extra={
             "session_id": session_id,
             "has_video": has_video,
-            "video_key": video_key
+            "video_key": video_key,
+            "video_size": video_size
         })
         
         # 動画がない場合はスキップ
@@ -65,6 +79,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "videoSkipReason": "no_video"
             }
         
+        # 上限サイズを超える動画はスキップ（サイズは開始ステップのlist_objects_v2結果を使用）
+        if video_size and video_size > MAX_VIDEO_SIZE_BYTES:
+            logger.warning("動画サイズが上限を超えているため、スキップ", extra={
+                "session_id": session_id,
+                "video_size": video_size,
+                "max_video_size": MAX_VIDEO_SIZE_BYTES
+            })
+            return {
+                **event,
+                "videoAnalysis": None,
+                "videoAnalyzed": False,
+                "videoSkipReason": "video_too_large"
+            }
+        
         # 動画分析を実行
         video_analysis = analyze_video(session_id, video_key, language)
         
@@ -109,15 +137,15 @@ def analyze_video(session_id: str, video_key: str, language: str) -> Optional[Di
         # プロンプト構築
         prompt = get_video_analysis_prompt(language)
         
-        # Bedrock呼び出し（Nova Premiere）
-        response = bedrock_runtime.converse(
+        # Bedrock呼び出し（Nova Premiere、ストリーミングで受信したテキストを取得）
+        response_text = converse_video_analysis(
             modelId=VIDEO_ANALYSIS_MODEL_ID,
             messages=[{
                 "role": "user",
                 "content": [
                     {
                         "video": {
-                            "format": "mp4",
+                            "format": get_video_format(video_key),
                             "source": {
                                 "s3Location": {
                                     "uri": video_uri
@@ -130,26 +158,14 @@ def analyze_video(session_id: str, video_key: str, language: str) -> Optional[Di
                     }
                 ]
             }],
-            inferenceConfig={
-                "maxTokens": 4096,
-                "temperature": 0.3
-            }
+            inferenceConfig=VIDEO_ANALYSIS_INFERENCE_CONFIG
         )
         
-        # レスポンス解析
-        response_text = response["output"]["message"]["content"][0]["text"]
-        
         # JSON部分を抽出
         try:
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-            if json_start >= 0 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                analysis_result = json.loads(json_str)
-                # 結果を正規化（旧形式からの変換も含む）
-                analysis_result = normalize_video_analysis(analysis_result)
-            else:
-                raise ValueError("JSONが見つかりません")
+            analysis_result = extract_json_object(response_text)
+            # 結果を正規化（旧形式からの変換も含む）
+            analysis_result = normalize_video_analysis(analysis_result)
         except json.JSONDecodeError as e:
             logger.error(f"JSON解析エラー: {str(e)}")
             analysis_result = create_default_video_analysis(language)
@@ -161,11 +177,8 @@ def analyze_video(session_id: str, video_key: str, language: str) -> Optional[Di
         return None
 
 
-def get_video_analysis_prompt(language: str) -> str:
-    """動画分析用プロンプトを取得"""
-    
-    if language == "en":
-        return """Analyze this sales roleplay video recording and evaluate the salesperson's performance.
+# 動画分析用プロンプト（固定文言のため初期化時に一度だけ定義）
+VIDEO_ANALYSIS_PROMPT_EN = """Analyze this sales roleplay video recording and evaluate the salesperson's performance.
 
 Focus on:
 1. Eye contact and gaze direction
@@ -189,8 +202,8 @@ Provide your analysis in the following JSON format (scores are 1-10):
 ```
 
 Respond ONLY with the JSON object."""
-    else:
-        return """この営業ロールプレイの録画動画を分析し、営業担当者のパフォーマンスを評価してください。
+
+VIDEO_ANALYSIS_PROMPT_JA = """この営業ロールプレイの録画動画を分析し、営業担当者のパフォーマンスを評価してください。
 
 以下の点に注目してください：
 1. アイコンタクトと視線の方向
@@ -216,6 +229,49 @@ Respond ONLY with the JSON object."""
 JSONオブジェクトのみを返してください。"""
 
 
+def converse_video_analysis(**request: Any) -> str:
+    """
+    動画分析のConverse Stream APIを呼び出し、モデル出力のテキストを返す
+
+    BEDROCK_LATENCY_OPTIMIZEDが有効な場合はperformanceConfigを指定し、
+    モデルが対応していない（ValidationException）場合は標準推論で再実行する。
+    """
+    global latency_optimized_available
+    
+    if latency_optimized_available:
+        try:
+            response = bedrock_runtime.converse_stream(**request, performanceConfig=LATENCY_OPTIMIZED_PERFORMANCE_CONFIG)
+            return read_video_analysis_stream(response["stream"])
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ValidationException":
+                raise
+            logger.warning("レイテンシ最適化推論に未対応のため標準推論で実行", extra={
+                "model_id": request.get("modelId"),
+                "error": str(e)
+            })
+            latency_optimized_available = False
+    
+    response = bedrock_runtime.converse_stream(**request)
+    return read_video_analysis_stream(response["stream"])
+
+
+# 言語ごとの動画分析用プロンプト
+VIDEO_ANALYSIS_PROMPTS = {
+    "en": VIDEO_ANALYSIS_PROMPT_EN,
+    "ja": VIDEO_ANALYSIS_PROMPT_JA,
+}
+
+
+def get_video_format(video_key: str) -> str:
+    """動画キーの拡張子（大文字小文字を区別しない）からConverse APIのformatを決定（検索対象はmp4/webmのみ）"""
+    return "webm" if video_key.lower().endswith(".webm") else "mp4"
+
+
+def get_video_analysis_prompt(language: str) -> str:
+    """動画分析用プロンプトを取得（未対応の言語は日本語）"""
+    return VIDEO_ANALYSIS_PROMPTS.get(language, VIDEO_ANALYSIS_PROMPT_JA)
+
+
 def create_default_video_analysis(language: str) -> Dict[str, Any]:
     """デフォルトの動画分析結果を作成"""
     if language == "en":
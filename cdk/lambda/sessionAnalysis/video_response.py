@@ -0,0 +1,68 @@
+"""
+動画分析のモデル出力解析モジュール
+
+Converse Stream APIが返した動画分析のテキストを読み取り、JSONオブジェクトを取り出します。
+boto3に依存しないため、単体テストから直接インポートできます。
+"""
+
+import json
+from typing import Dict, Any
+
+# モデル出力のパースにはorjsonを使用（未導入の環境では標準のjsonにフォールバック）
+try:
+    import orjson as fast_json
+except ImportError:
+    fast_json = json
+
+# JSONの後ろに説明文が続く場合の解析用（開始位置から1回の走査でオブジェクトを読み取る）
+json_decoder = json.JSONDecoder()
+
+
+def extract_json_object(response_text: str) -> Dict[str, Any]:
+    """
+    モデル出力から最初のJSONオブジェクトを取り出す
+
+    末尾のコードフェンスを除いた範囲をorjsonで解析し、
+    JSONの後ろに説明文が続く場合はraw_decodeで開始位置から読み取る。
+    """
+    json_start = response_text.find("{")
+    if json_start < 0:
+        raise ValueError("JSONが見つかりません")
+    
+    json_end = len(response_text.rstrip().rstrip("`").rstrip())
+    try:
+        return fast_json.loads(response_text[json_start:json_end])
+    except json.JSONDecodeError:
+        result, _ = json_decoder.raw_decode(response_text, json_start)
+        return result
+
+
+def read_video_analysis_stream(stream: Any) -> str:
+    """
+    Converse Streamのテキストを連結して返す
+
+    JSONオブジェクトが閉じた時点でストリームを閉じ、後続の説明文やコードフェンスの生成を待たない。
+    """
+    chunks = []
+    try:
+        for event in stream:
+            text = event.get("contentBlockDelta", {}).get("delta", {}).get("text")
+            if not text:
+                continue
+            chunks.append(text)
+            
+            # "}"を含むチャンクを受信したときだけ、JSONが完結したかを確認
+            if "}" in text:
+                response_text = "".join(chunks)
+                json_start = response_text.find("{")
+                if json_start < 0:
+                    continue
+                try:
+                    json_decoder.raw_decode(response_text, json_start)
+                except json.JSONDecodeError:
+                    continue
+                return response_text
+    finally:
+        stream.close()
+    
+    return "".join(chunks)
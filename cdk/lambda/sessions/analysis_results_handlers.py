@@ -11,7 +11,9 @@ AgentCore Memoryから会話履歴・メトリクスを取得します。
 import os
 import time
 import json
+import traceback
 import boto3
+import orjson
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.event_handler import APIGatewayRestResolver
 from aws_lambda_powertools.event_handler.exceptions import (
@@ -19,40 +21,20 @@ from aws_lambda_powertools.event_handler.exceptions import (
 )
 import boto3.dynamodb.conditions
 
-from utils import get_user_id_from_event, sessions_table, messages_table, scenarios_table, dynamodb
+from utils import (
+    get_user_id_from_event, sessions_table, messages_table, scenarios_table, session_feedback_table,
+    dynamodb_client, deserialize_item, SESSION_FEEDBACK_TABLE
+)
 
-from realtime_scoring import calculate_realtime_scores
-from datetime import datetime
-from decimal import Decimal
+# 分析結果レスポンスで使用するSessionFeedbackの属性のみを取得する
+# （userMessageやgoalStatusesなど未使用の属性を転送しない）
+FEEDBACK_RESULT_PROJECTION = (
+    'dataType, createdAt, feedbackData, finalMetrics, goalResults, '
+    'videoAnalysis, videoAnalysisJson, videoUrl, referenceCheck, complianceData, '
+    'messageNumber, angerLevel, trustLevel, progressLevel, analysis'
+)
 
 
-def json_serializable(obj):
-    """
-    オブジェクトをJSONシリアライズ可能な形式に変換する再帰関数
-    datetime, Decimal, その他のシリアライズ不可能な型を処理
-    """
-    if obj is None:
-        return None
-    elif isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, Decimal):
-        # 整数の場合はintに、小数の場合はfloatに変換
-        if obj % 1 == 0:
-            return int(obj)
-        return float(obj)
-    elif isinstance(obj, dict):
-        return {k: json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [json_serializable(item) for item in obj]
-    elif isinstance(obj, (str, int, float, bool)):
-        return obj
-    elif hasattr(obj, 'isoformat'):
-        # datetime以外のisoformat対応オブジェクト
-        return obj.isoformat()
-    else:
-        # その他の型は文字列に変換
-        return str(obj)
-
 # ロガー設定
 logger = Logger(service="analysis-results-handlers")
 
@@ -306,7 +288,6 @@ def get_session_data_from_memory(session_id: str, actor_id: str):
             "session_id": session_id,
             "actor_id": actor_id
         })
-        import traceback
         logger.error("Traceback", extra={"traceback": traceback.format_exc()})
         return []
 
@@ -375,6 +356,9 @@ def calculate_audio_analysis_metrics(messages, scenario_goals, session_id, langu
         })
     
     # 既存のリアルタイムスコアリング関数を使用
+    # （Strands Agentsの読み込みは重いため、音声分析の経路でのみ遅延インポートする）
+    from realtime_scoring import calculate_realtime_scores
+    
     try:
         scores = calculate_realtime_scores(
             user_input=last_user_message.get("content", ""),
@@ -584,21 +568,28 @@ def handle_audio_analysis_session(session_id: str, user_id: str, audio_analysis_
         # （Step Functionsで既に生成されているため、ここでは実行しない）
         
         # 既に保存されているfinal-feedbackを取得
-        session_feedback_table_name = os.environ.get('SESSION_FEEDBACK_TABLE', 'dev-AISalesRolePlay-SessionFeedback')
-        feedback_table = dynamodb.Table(session_feedback_table_name)
         existing_feedback = None
         existing_metrics = None
         try:
-            feedback_response = feedback_table.query(
-                KeyConditionExpression=boto3.dynamodb.conditions.Key('sessionId').eq(session_id),
-                FilterExpression=boto3.dynamodb.conditions.Attr('dataType').eq('final-feedback'),
-                ScanIndexForward=False,
-                Limit=1
+            # sessionId + dataTypeのGSIでfinal-feedbackのみを読み取る
+            # （FilterExpressionは読み取り後に適用されるため、セッション内の全アイテム分のRCUを消費してしまう）
+            # 低レベルクライアントで取得し、数値はDecimalを経由せずint/floatに変換する
+            feedback_response = dynamodb_client.query(
+                TableName=SESSION_FEEDBACK_TABLE,
+                IndexName='sessionId-dataType-index',
+                KeyConditionExpression='sessionId = :sessionId AND dataType = :dataType',
+                ExpressionAttributeValues={
+                    ':sessionId': {'S': session_id},
+                    ':dataType': {'S': 'final-feedback'}
+                },
+                ProjectionExpression='feedbackData, finalMetrics, createdAt'
             )
-            feedback_items = feedback_response.get('Items', [])
+            feedback_items = [deserialize_item(item) for item in feedback_response.get('Items', [])]
             if feedback_items:
-                existing_feedback = feedback_items[0].get('feedbackData')
-                existing_metrics = feedback_items[0].get('finalMetrics')
+                # GSI内ではcreatedAt順に並ばないため、最新のものを選択
+                latest_feedback = max(feedback_items, key=lambda item: item.get('createdAt', ''))
+                existing_feedback = latest_feedback.get('feedbackData')
+                existing_metrics = latest_feedback.get('finalMetrics')
                 logger.info("既存のフィードバックを使用", extra={
                     "session_id": session_id,
                     "overall_score": existing_feedback.get("scores", {}).get("overall") if existing_feedback else None
@@ -665,8 +656,8 @@ def handle_audio_analysis_session(session_id: str, user_id: str, audio_analysis_
             "feedback_source": "existing" if existing_feedback else "default"
         })
         
-        # JSONシリアライズ可能な形式に変換して返す
-        return json_serializable(response_data)
+        # Decimal等の変換はレスポンスのシリアライザー（orjson）で行う
+        return response_data
         
     except Exception as e:
         logger.exception("音声分析セッションデータ構築エラー", extra={
@@ -675,6 +666,17 @@ def handle_audio_analysis_session(session_id: str, user_id: str, audio_analysis_
         })
         raise InternalServerError(f"音声分析セッションデータの構築中にエラーが発生しました: {str(e)}")
 
+def get_video_analysis(final_feedback: dict):
+    """final-feedbackアイテムから動画分析結果を取得
+    
+    新しいアイテムはJSON文字列（videoAnalysisJson）、既存のアイテムはMap属性（videoAnalysis）で保存されている。
+    """
+    video_analysis_json = final_feedback.get("videoAnalysisJson")
+    if video_analysis_json:
+        return orjson.loads(video_analysis_json)
+    return final_feedback.get("videoAnalysis")
+
+
 def register_analysis_results_routes(app: APIGatewayRestResolver):
     """
     セッション分析結果関連のルートを登録
@@ -713,30 +715,30 @@ def register_analysis_results_routes(app: APIGatewayRestResolver):
                 })
                 raise InternalServerError(f"ユーザーID取得エラー: {str(user_error)}")
             
-            # 各テーブル名を取得
-            session_feedback_table_name = os.environ.get('SESSION_FEEDBACK_TABLE', 'dev-AISalesRolePlay-SessionFeedback')
-            logger.debug("フィードバックテーブル名取得", extra={
-                "table_name": session_feedback_table_name,
-                "session_id": session_id
-            })
-
             # まず音声分析セッションかどうかを確認
             try:
-                feedback_table = dynamodb.Table(session_feedback_table_name)
+                feedback_table = session_feedback_table
                 logger.debug("音声分析セッション判定開始", extra={
                     "session_id": session_id,
                     "user_id": user_id
                 })
                 
-                # Limitを削除してFilterExpressionが正しく機能するようにする
-                # FilterExpressionはLimit適用後に評価されるため、Limitがあると結果が0件になる可能性がある
+                # sessionId + dataTypeのGSIで音声分析結果のみを取得
+                # （FilterExpressionではセッション内の全アイテム分のRCUを消費してしまう）
                 audio_analysis_response = feedback_table.query(
-                    KeyConditionExpression=boto3.dynamodb.conditions.Key('sessionId').eq(session_id),
-                    FilterExpression=boto3.dynamodb.conditions.Attr('dataType').eq('audio-analysis-result'),
-                    ScanIndexForward=False
+                    IndexName='sessionId-dataType-index',
+                    KeyConditionExpression=(
+                        boto3.dynamodb.conditions.Key('sessionId').eq(session_id)
+                        & boto3.dynamodb.conditions.Key('dataType').eq('audio-analysis-result')
+                    )
                 )
                 
-                audio_analysis_items = audio_analysis_response.get('Items', [])
+                # GSI内ではcreatedAt順に並ばないため、新しい順に並べ替える
+                audio_analysis_items = sorted(
+                    audio_analysis_response.get('Items', []),
+                    key=lambda item: item.get('createdAt', ''),
+                    reverse=True
+                )
                 logger.info("音声分析セッション判定完了", extra={
                     "session_id": session_id,
                     "items_count": len(audio_analysis_items)
@@ -794,6 +796,7 @@ def register_analysis_results_routes(app: APIGatewayRestResolver):
             # フィードバックデータをDynamoDBから取得（Step Functionsで生成済み）
             feedback_response = feedback_table.query(
                 KeyConditionExpression=boto3.dynamodb.conditions.Key('sessionId').eq(session_id),
+                ProjectionExpression=FEEDBACK_RESULT_PROJECTION,
                 ScanIndexForward=False  # 降順ソート（最新が先頭）
             )
             
@@ -879,8 +882,9 @@ def register_analysis_results_routes(app: APIGatewayRestResolver):
                 response_data["goalResults"] = final_feedback.get("goalResults")
                 
                 # 動画分析結果があれば追加
-                if final_feedback.get("videoAnalysis"):
-                    response_data["videoAnalysis"] = final_feedback.get("videoAnalysis")
+                video_analysis = get_video_analysis(final_feedback)
+                if video_analysis:
+                    response_data["videoAnalysis"] = video_analysis
                     response_data["videoUrl"] = final_feedback.get("videoUrl")
                 
                 # 参照資料評価結果があれば追加
@@ -910,7 +914,7 @@ def register_analysis_results_routes(app: APIGatewayRestResolver):
             })
             
             # JSONシリアライズ可能な形式に変換して返す
-            return json_serializable(response_data)
+            return response_data
             
         except NotFoundError:
             raise
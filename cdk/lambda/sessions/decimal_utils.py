@@ -0,0 +1,87 @@
+"""
+Decimal/float変換ユーティリティ
+
+DynamoDBのDecimalとJSONシリアライズ可能な数値の相互変換を提供します。
+boto3に依存しないため、単体テストから直接インポートできます。
+"""
+
+from decimal import Decimal
+
+
+def decimal_to_number(value: Decimal):
+    """
+    Decimalを整数値ならint、それ以外はfloatに変換する
+
+    convert_float_to_decimal(5.0)が返すDecimal('5.0')のように正規化されていない値も
+    整数として扱うため、指数部ではなく値で判定する。
+
+    Args:
+        value: 変換対象のDecimal
+
+    Returns:
+        int | float: 変換後の数値
+    """
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def convert_decimal_to_json_serializable(obj):
+    """
+    DynamoDBのDecimal型をJSONシリアライズ可能な形式に変換する
+
+    dict/listは新しいオブジェクトを作らずにその場で書き換える（再帰呼び出しも行わない）。
+    Decimalは値が整数であれば（Decimal('5.0')を含む）intに、それ以外はfloatに変換する。
+    
+    Args:
+        obj: 変換対象のオブジェクト（dict/listの場合は直接書き換えられる）
+        
+    Returns:
+        JSONシリアライズ可能なオブジェクト
+    """
+    _decimal = Decimal
+    _to_number = decimal_to_number
+    if isinstance(obj, _decimal):
+        return _to_number(obj)
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        entries = current.items() if isinstance(current, dict) else enumerate(current)
+        for key, value in entries:
+            if isinstance(value, _decimal):
+                # Decimalを適切な数値型に変換
+                current[key] = _to_number(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return obj
+
+
+def convert_float_to_decimal(obj):
+    """
+    Float型をDynamoDB互換のDecimal型に変換する
+
+    dict/listは新しいオブジェクトを作らずにその場で書き換える（再帰呼び出しも行わない）。
+    
+    Args:
+        obj: 変換対象のオブジェクト（dict/listの場合は直接書き換えられる）
+        
+    Returns:
+        DynamoDB互換なオブジェクト
+    """
+    _decimal = Decimal
+    if isinstance(obj, float):
+        return _decimal(str(obj))
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        entries = current.items() if isinstance(current, dict) else enumerate(current)
+        for key, value in entries:
+            if isinstance(value, float):
+                current[key] = _decimal(str(value))
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return obj
@@ -39,6 +39,7 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from session_handlers import register_session_routes
 from message_handlers import register_message_routes
 from analysis_results_handlers import register_analysis_results_routes
+from utils import serialize_response
 
 # Powertools ロガー設定
 logger = Logger(service="sessions-api")
@@ -51,8 +52,8 @@ cors_config = CORSConfig(
     allow_credentials=True  # 認証情報を許可
 )
 
-# APIGatewayRestResolverの初期化
-app = APIGatewayRestResolver(cors=cors_config)
+# APIGatewayRestResolverの初期化（レスポンスはorjsonでシリアライズ）
+app = APIGatewayRestResolver(cors=cors_config, serializer=serialize_response)
 
 # 各ハンドラーモジュールからルートを登録
 register_session_routes(app)
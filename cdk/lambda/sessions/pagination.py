@@ -0,0 +1,31 @@
+"""
+ページネーショントークンユーティリティ
+
+DynamoDBのLastEvaluatedKeyとAPIのページネーショントークン（nextToken）を相互に変換します。
+"""
+
+import base64
+import orjson
+
+
+def encode_next_token(last_evaluated_key: dict) -> str:
+    """LastEvaluatedKeyをURLセーフなBase64のページネーショントークンに変換"""
+    return base64.urlsafe_b64encode(orjson.dumps(last_evaluated_key)).decode()
+
+
+def decode_next_token(next_token: str) -> dict:
+    """
+    ページネーショントークンをExclusiveStartKeyに復元
+    
+    以前のJSON文字列形式のトークンも受け付けます。
+    
+    Raises:
+        ValueError: トークンが不正な場合（orjson.JSONDecodeError、binascii.Errorを含む）
+    """
+    if next_token.startswith('{'):
+        key = orjson.loads(next_token)
+    else:
+        key = orjson.loads(base64.urlsafe_b64decode(next_token))
+    if not isinstance(key, dict):
+        raise ValueError("ページネーショントークンの形式が不正です")
+    return key
@@ -1,7 +1,10 @@
 import os
 import boto3
-from datetime import datetime, timedelta
-from boto3.dynamodb.conditions import Attr
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from botocore.config import Config
+from boto3.dynamodb.conditions import Key
 from aws_lambda_powertools import Logger
 
 # 環境変数の取得
@@ -9,10 +12,109 @@ SESSION_FEEDBACK_TABLE = os.environ.get('SESSION_FEEDBACK_TABLE', 'dev-AISalesRo
 SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE', 'dev-AISalesRolePlay-Sessions')
 MESSAGE_TTL_DAYS = int(os.environ.get('MESSAGE_TTL_DAYS', '180'))  # デフォルト180日
 
-# DynamoDBリソースの初期化
-dynamodb = boto3.resource('dynamodb')
+# DynamoDBリソースの初期化（並行リクエスト用に接続プールを確保）
+dynamodb = boto3.resource('dynamodb', config=Config(max_pool_connections=10, tcp_keepalive=True))
 logger = Logger(service="sessions-api")
 
+# セッション情報の取得を並行実行するためのスレッドプール
+executor = ThreadPoolExecutor(max_workers=4)
+
+
+@lru_cache(maxsize=2048)
+def find_session_by_id(session_id):
+    """
+    セッションIDからセッションの所有ユーザーとシナリオIDを取得する関数
+    
+    SessionIdIndex（sessionIdをキーとするGSI）を検索します。
+    セッションの所有者とシナリオは変わらないため、結果はウォームな
+    Lambdaインスタンス内でキャッシュします。
+    
+    Args:
+        session_id (str): セッションID
+    
+    Returns:
+        dict: userId / sessionId / scenarioId を含むセッション情報
+    
+    Raises:
+        LookupError: セッションが見つからない場合（結果はキャッシュされない）
+    """
+    sessions_table = dynamodb.Table(SESSIONS_TABLE)
+    response = sessions_table.query(
+        IndexName='SessionIdIndex',
+        KeyConditionExpression=Key('sessionId').eq(session_id),
+        Limit=1
+    )
+    
+    items = response.get('Items', [])
+    if not items:
+        raise LookupError(f"セッションが見つかりません: {session_id}")
+    
+    return items[0]
+
+
+def get_session_item(user_id, session_id):
+    """
+    ユーザーIDとセッションIDでセッション情報を直接取得する関数
+    
+    Args:
+        user_id (str): ユーザーID
+        session_id (str): セッションID
+    
+    Returns:
+        dict: セッション情報（見つからない場合はNone）
+    """
+    sessions_table = dynamodb.Table(SESSIONS_TABLE)
+    response = sessions_table.get_item(
+        Key={
+            'userId': user_id,
+            'sessionId': session_id
+        }
+    )
+    return response.get('Item')
+
+
+def fetch_session_info(session_id, user_id=None):
+    """
+    セッション情報を取得する関数
+    
+    ユーザーIDがある場合は get_item と SessionIdIndex の検索を並行して発行し、
+    先に項目を返した方の結果を使用します。ユーザーIDが古い場合でも
+    2回分の往復を待たずに済みます。
+    
+    Args:
+        session_id (str): セッションID
+        user_id (str): ユーザーID（オプション）
+    
+    Returns:
+        dict: セッション情報
+    
+    Raises:
+        LookupError: どちらの方法でもセッションが見つからない場合
+    """
+    if not user_id:
+        return find_session_by_id(session_id)
+    
+    pending = {
+        executor.submit(get_session_item, user_id, session_id),
+        executor.submit(find_session_by_id, session_id)
+    }
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                item = future.result()
+            except Exception as e:
+                logger.debug(f"セッション情報の取得に失敗しました: {str(e)}")
+                continue
+            if item:
+                # 未完了の検索は不要（実行中のものは結果を捨てる）
+                for other in pending:
+                    other.cancel()
+                return item
+    
+    raise LookupError(f"セッションが見つかりません: {session_id}")
+
+
 def save_feedback_to_dynamodb(session_id, feedback_data, final_metrics, messages, goal_data=None, user_id=None):
     """
     フィードバックデータをDynamoDBに保存する関数
@@ -31,37 +133,16 @@ def save_feedback_to_dynamodb(session_id, feedback_data, final_metrics, messages
     try:
         # フィードバックデータ保存用のテーブル
         feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
-        sessions_table = dynamodb.Table(SESSIONS_TABLE)
         
         # セッション情報を取得してシナリオIDを確認
         session_info = None
         scenario_id = ""
         
         try:
-            # セッション情報の取得
-            if user_id:
-                # ユーザーIDとセッションIDがある場合は直接取得
-                session_response = sessions_table.get_item(
-                    Key={
-                        'userId': user_id,
-                        'sessionId': session_id
-                    }
-                )
-                if 'Item' in session_response:
-                    session_info = session_response['Item']
-            
-            # 直接取得できない場合はスキャンを試みる
-            if not session_info:
-                session_response = sessions_table.scan(
-                    FilterExpression=Attr('sessionId').eq(session_id)
-                )
-                
-                session_items = session_response.get('Items', [])
-                if session_items:
-                    session_info = session_items[0]
-                    # ユーザーIDが渡されていない場合は取得して保存
-                    if not user_id and 'userId' in session_info:
-                        user_id = session_info['userId']
+            session_info = fetch_session_info(session_id, user_id)
+            # ユーザーIDが渡されていない場合は取得して保存
+            if not user_id and 'userId' in session_info:
+                user_id = session_info['userId']
         except Exception as e:
             logger.warning(f"セッション情報取得エラー: {str(e)}")
         
@@ -78,10 +159,11 @@ def save_feedback_to_dynamodb(session_id, feedback_data, final_metrics, messages
                 overall_score = 0
                 
         # 現在のタイムスタンプ
-        current_time = datetime.utcnow().isoformat() + 'Z'
+        now = datetime.now(timezone.utc)
+        current_time = now.isoformat().replace('+00:00', 'Z')
         
         # TTL設定（デフォルト180日）
-        ttl = int((datetime.utcnow() + timedelta(days=MESSAGE_TTL_DAYS)).timestamp())
+        ttl = int((now + timedelta(days=MESSAGE_TTL_DAYS)).timestamp())
         
         # フィードバックアイテムの作成
         feedback_item = {
@@ -4,8 +4,10 @@
 セッション一覧取得、セッション詳細取得、セッション作成などの機能を提供します。
 """
 
-import json
 import uuid
+from collections import ChainMap
+from operator import itemgetter
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.event_handler import APIGatewayRestResolver
@@ -14,16 +16,50 @@ from aws_lambda_powertools.event_handler.exceptions import (
 )
 
 from utils import get_user_id_from_event, sessions_table, SESSIONS_TABLE
+from pagination import encode_next_token, decode_next_token
 
 # ロガー設定
 logger = Logger(service="session-handlers")
 
+# セッション詳細のキャッシュ（(userId, sessionId) -> セッション情報、30秒で失効）
+session_cache = TTLCache(maxsize=512, ttl=30)
+
+# セッション一覧で取得する属性（レスポンスに含めるフィールドのみ）
+SESSION_LIST_PROJECTION = (
+    'sessionId, scenarioId, title, createdAt, updatedAt, #st, '
+    'npcInfo.#n, npcInfo.#r, npcInfo.company'
+)
+SESSION_LIST_ATTRIBUTE_NAMES = {'#st': 'status', '#n': 'name', '#r': 'role'}
+
+# セッション一覧のレスポンスに含めるフィールドとデフォルト値
+SESSION_SUMMARY_DEFAULTS = {
+    'sessionId': None,
+    'scenarioId': None,
+    'title': 'タイトルなし',
+    'createdAt': '',
+    'updatedAt': '',
+    'status': 'active'
+}
+NPC_SUMMARY_DEFAULTS = {'name': '不明', 'role': '', 'company': ''}
+get_session_summary_fields = itemgetter(*SESSION_SUMMARY_DEFAULTS)
+get_npc_summary_fields = itemgetter(*NPC_SUMMARY_DEFAULTS)
+
 
 def calculate_expiration_time(days: int = 90) -> int:
     """TTL用の有効期限を計算（UNIXタイムスタンプ）"""
     expiry_date = datetime.now() + timedelta(days=days)
     return int(expiry_date.timestamp())
 
+def to_session_summary(item: dict) -> dict:
+    """セッション項目から一覧表示用のフィールドを抽出（欠けている値はデフォルト値で補完）"""
+    return dict(zip(SESSION_SUMMARY_DEFAULTS, get_session_summary_fields(ChainMap(item, SESSION_SUMMARY_DEFAULTS))))
+
+
+def to_npc_summary(npc_info: dict) -> dict:
+    """NPC情報から一覧表示用のフィールドを抽出（欠けている値はデフォルト値で補完）"""
+    return dict(zip(NPC_SUMMARY_DEFAULTS, get_npc_summary_fields(ChainMap(npc_info, NPC_SUMMARY_DEFAULTS))))
+
+
 def register_session_routes(app: APIGatewayRestResolver):
     """
     セッション関連のルートを登録
@@ -93,12 +129,17 @@ def register_session_routes(app: APIGatewayRestResolver):
                     'ScanIndexForward': False  # 降順（最新のセッションから）
                 }
             
+            # 一覧表示に必要な属性のみを取得
+            if dynamo_query_params:
+                dynamo_query_params['ProjectionExpression'] = SESSION_LIST_PROJECTION
+                dynamo_query_params['ExpressionAttributeNames'] = SESSION_LIST_ATTRIBUTE_NAMES
+            
             # ページネーショントークンの追加
             if next_token:
                 try:
-                    dynamo_query_params['ExclusiveStartKey'] = json.loads(next_token)
-                except (json.JSONDecodeError, TypeError) as json_error:
-                    logger.error("無効なnextTokenパラメータ", extra={"error": str(json_error), "nextToken": next_token})
+                    dynamo_query_params['ExclusiveStartKey'] = decode_next_token(next_token)
+                except (ValueError, TypeError) as token_error:
+                    logger.error("無効なnextTokenパラメータ", extra={"error": str(token_error), "nextToken": next_token})
                     raise BadRequestError("無効なページネーショントークンです")
             
             # DynamoDBテーブルが存在するか確認
@@ -109,33 +150,19 @@ def register_session_routes(app: APIGatewayRestResolver):
             # DynamoDBクエリの実行
             response = sessions_table.query(**dynamo_query_params)
             
-            # レスポンス用のセッションリストを作成
-            sessions = []
-            for item in response.get('Items', []):
-                # レスポンス用に必要なフィールドだけを抽出
-                session = {
-                    'sessionId': item.get('sessionId'),
-                    'scenarioId': item.get('scenarioId'),
-                    'title': item.get('title', 'タイトルなし'),  # デフォルト値を設定
-                    'createdAt': item.get('createdAt', ''),
-                    'updatedAt': item.get('updatedAt', ''),
-                    'status': item.get('status', 'active')
-                }
-                
-                # NPCの基本情報があれば追加
+            # レスポンス用のセッションリストを作成（必要なフィールドだけを抽出）
+            items = response.get('Items', [])
+            sessions = [to_session_summary(item) for item in items]
+            
+            # NPCの基本情報があれば追加
+            for session, item in zip(sessions, items):
                 if 'npcInfo' in item:
-                    session['npcInfo'] = {
-                        'name': item['npcInfo'].get('name', '不明'),
-                        'role': item['npcInfo'].get('role', ''),
-                        'company': item['npcInfo'].get('company', '')
-                    }
-                
-                sessions.append(session)
+                    session['npcInfo'] = to_npc_summary(item['npcInfo'])
             
             # 次ページのトークン
             next_token = None
             if 'LastEvaluatedKey' in response:
-                next_token = json.dumps(response['LastEvaluatedKey'])
+                next_token = encode_next_token(response['LastEvaluatedKey'])
             
             return {
                 'sessions': sessions,
@@ -172,6 +199,15 @@ def register_session_routes(app: APIGatewayRestResolver):
             if not session_id:
                 raise BadRequestError("セッションIDが指定されていません")
             
+            # ウォームなインスタンスでは直近に取得したセッション情報を再利用
+            # （Cache-Control: no-cache が指定された場合は常にDynamoDBから取得）
+            cache_key = (user_id, session_id)
+            cache_control = app.current_event.get_header_value(
+                'Cache-Control', default_value='', case_sensitive=False
+            )
+            if 'no-cache' not in cache_control and cache_key in session_cache:
+                return session_cache[cache_key]
+            
             # セッション情報の取得
             if sessions_table:
                 response = sessions_table.get_item(
@@ -186,6 +222,7 @@ def register_session_routes(app: APIGatewayRestResolver):
                     raise NotFoundError(f"セッションが見つかりません: {session_id}")
                 
                 session = response['Item']
+                session_cache[cache_key] = session
                 return session
             else:
                 logger.error("セッションテーブル未定義", extra={"table_name": SESSIONS_TABLE})
@@ -278,6 +315,7 @@ def register_session_routes(app: APIGatewayRestResolver):
                     UpdateExpression='SET ' + ', '.join(update_expression_parts),
                     ExpressionAttributeValues=expression_values
                 )
+                session_cache.pop((user_id, session_id), None)
                 
                 logger.info("既存セッションを更新しました", extra={
                     "session_id": session_id,
@@ -312,6 +350,7 @@ def register_session_routes(app: APIGatewayRestResolver):
                     session_item['npcInfo'] = npc_info
                 
                 sessions_table.put_item(Item=session_item)
+                session_cache.pop((user_id, session_id), None)
                 
                 logger.info("新規セッションを作成しました", extra={
                     "session_id": session_id,
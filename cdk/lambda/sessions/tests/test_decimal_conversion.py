@@ -0,0 +1,115 @@
+"""
+Decimal/float変換ロジックのテスト
+
+decimal_utils.py の convert_decimal_to_json_serializable / convert_float_to_decimal が
+再帰呼び出しを使わずにdict/listをその場で書き換える実装で、以下を満たすことを検証する:
+- ネストしたdict/listの内側まで変換される
+- Decimalは値が整数なら（Decimal('5.0')のように正規化されていない値も含めて）整数、それ以外は小数として扱われる
+- dict/list以外の値はそのまま返る
+"""
+from decimal import Decimal
+
+import pytest
+
+from decimal_utils import convert_decimal_to_json_serializable, convert_float_to_decimal
+
+
+class TestConvertDecimalToJsonSerializable:
+    """DynamoDBのDecimalをJSONシリアライズ可能な値に変換するテスト"""
+
+    @pytest.mark.parametrize("value, expected, expected_type", [
+        (Decimal("1"), 1, int),
+        (Decimal("0"), 0, int),
+        (Decimal("-3"), -3, int),
+        (Decimal("1E+1"), 10, int),    # DynamoDBが正規化した整数
+        (Decimal("5.0"), 5, int),      # convert_float_to_decimal(5.0)のような正規化されていない整数
+        (Decimal("2.50"), 2.5, float),
+        (Decimal("1.5"), 1.5, float),
+        (Decimal("0.1"), 0.1, float),
+    ])
+    def test_Decimalの変換(self, value, expected, expected_type):
+        result = convert_decimal_to_json_serializable(value)
+
+        assert result == expected
+        assert type(result) is expected_type
+
+    def test_ネストしたdictとlistの内側まで変換される(self):
+        item = {
+            "angerLevel": Decimal("3"),
+            "scores": {"overall": Decimal("7.5"), "details": [Decimal("1"), {"value": Decimal("2.25")}]},
+            "history": [[Decimal("4")], []],
+            "label": "営業",
+        }
+
+        result = convert_decimal_to_json_serializable(item)
+
+        assert result == {
+            "angerLevel": 3,
+            "scores": {"overall": 7.5, "details": [1, {"value": 2.25}]},
+            "history": [[4], []],
+            "label": "営業",
+        }
+        assert type(result["scores"]["details"][0]) is int
+        assert type(result["scores"]["details"][1]["value"]) is float
+
+    def test_dictはその場で書き換えられる(self):
+        item = {"nested": {"value": Decimal("2")}}
+        nested = item["nested"]
+
+        result = convert_decimal_to_json_serializable(item)
+
+        assert result is item
+        assert nested["value"] == 2
+
+    @pytest.mark.parametrize("value", ["text", 10, 1.5, None, True])
+    def test_dictとlist以外の値はそのまま返る(self, value):
+        assert convert_decimal_to_json_serializable(value) is value
+
+    def test_深いネストでも再帰上限に達しない(self):
+        item = root = {}
+        for _ in range(5000):
+            item["child"] = {"value": Decimal("1")}
+            item = item["child"]
+
+        convert_decimal_to_json_serializable(root)
+
+        assert item["value"] == 1
+
+
+class TestConvertFloatToDecimal:
+    """floatをDynamoDB互換のDecimalに変換するテスト"""
+
+    def test_floatは文字列表現のままDecimalになる(self):
+        # Decimal(0.1)のような2進誤差を含まない
+        assert convert_float_to_decimal(0.1) == Decimal("0.1")
+        assert convert_float_to_decimal(1.0) == Decimal("1.0")
+
+    def test_ネストしたdictとlistの内側まで変換される(self):
+        metrics = {"angerLevel": 3, "trust": 4.5, "history": [1.25, {"value": 0.5}, "text"]}
+
+        result = convert_float_to_decimal(metrics)
+
+        assert result == {
+            "angerLevel": 3,
+            "trust": Decimal("4.5"),
+            "history": [Decimal("1.25"), {"value": Decimal("0.5")}, "text"],
+        }
+        assert type(result["angerLevel"]) is int
+
+    @pytest.mark.parametrize("value", ["text", 10, None, Decimal("1.5")])
+    def test_float以外の値はそのまま返る(self, value):
+        assert convert_float_to_decimal(value) is value
+
+    def test_往復するとDynamoDBから読み取った値と同じ型になる(self):
+        metrics = {"overall": 7.5, "count": 3}
+
+        restored = convert_decimal_to_json_serializable(convert_float_to_decimal(metrics))
+
+        assert restored == {"overall": 7.5, "count": 3}
+        assert type(restored["overall"]) is float
+
+    def test_整数値のfloatは往復すると整数になる(self):
+        restored = convert_decimal_to_json_serializable(convert_float_to_decimal({"angerLevel": 5.0}))
+
+        assert restored == {"angerLevel": 5}
+        assert type(restored["angerLevel"]) is int
@@ -0,0 +1,61 @@
+"""
+ページネーショントークンのエンコード・デコードのテスト
+
+pagination.py のトークン変換ロジックが以下を満たすことを検証する:
+- LastEvaluatedKeyがURLセーフなBase64トークンとして往復できる
+- 以前のJSON文字列形式（'{'で始まる）のトークンも受け付ける
+- 不正なトークンはValueErrorとして扱われる
+"""
+import base64
+import json
+
+import pytest
+
+from pagination import encode_next_token, decode_next_token
+
+
+class TestPaginationToken:
+    """ページネーショントークンのテスト"""
+
+    def test_エンコードしたトークンを元のキーに復元できる(self):
+        last_evaluated_key = {"userId": "user-1", "sessionId": "session-123", "createdAt": "2026-02-10T06:49:07Z"}
+
+        token = encode_next_token(last_evaluated_key)
+
+        assert decode_next_token(token) == last_evaluated_key
+
+    def test_トークンはURLセーフな文字のみで構成される(self):
+        # Base64で「+」「/」になりやすい値を含むキー
+        last_evaluated_key = {"userId": "user-?>?>", "sessionId": "~~~???"}
+
+        token = encode_next_token(last_evaluated_key)
+
+        assert "+" not in token and "/" not in token
+        assert decode_next_token(token) == last_evaluated_key
+
+    def test_マルチバイト文字を含むキーも往復できる(self):
+        last_evaluated_key = {"userId": "ユーザー", "sessionId": "セッション"}
+
+        assert decode_next_token(encode_next_token(last_evaluated_key)) == last_evaluated_key
+
+    def test_以前のJSON文字列形式のトークンも受け付ける(self):
+        legacy_token = json.dumps({"userId": "user-1", "sessionId": "session-123"})
+
+        assert decode_next_token(legacy_token) == {"userId": "user-1", "sessionId": "session-123"}
+
+    @pytest.mark.parametrize("next_token", [
+        "not-a-token!!",   # Base64として不正
+        "{invalid json",   # 以前の形式だがJSONとして不正
+        base64.urlsafe_b64encode(b"not json").decode(),  # Base64は正しいが中身がJSONではない
+    ])
+    def test_不正なトークンはValueErrorになる(self, next_token):
+        # orjson.JSONDecodeError、binascii.ErrorはいずれもValueErrorのサブクラス
+        with pytest.raises(ValueError):
+            decode_next_token(next_token)
+
+    @pytest.mark.parametrize("payload", [[1, 2, 3], "session-123", 123, None])
+    def test_オブジェクト以外を含むトークンはValueErrorになる(self, payload):
+        token = encode_next_token(payload)
+
+        with pytest.raises(ValueError):
+            decode_next_token(token)
@@ -5,11 +5,18 @@
 """
 
 import os
+import time
+import orjson
 import boto3
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
 from decimal import Decimal
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.event_handler import APIGatewayRestResolver
 
+# Decimal/float変換（boto3に依存しないモジュールに分離し、単体テストから直接使用する）
+from decimal_utils import decimal_to_number, convert_decimal_to_json_serializable, convert_float_to_decimal
+
 # ロガー設定
 logger = Logger(service="sessions-utils")
 
@@ -17,18 +24,34 @@ logger = Logger(service="sessions-utils")
 SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
 MESSAGES_TABLE = os.environ.get('MESSAGES_TABLE')
 SCENARIOS_TABLE = os.environ.get('SCENARIOS_TABLE')
+SESSION_FEEDBACK_TABLE = os.environ.get('SESSION_FEEDBACK_TABLE', 'dev-AISalesRolePlay-SessionFeedback')
+
+# メッセージ検証用の定義
+REQUIRED_MESSAGE_FIELDS = frozenset(('sessionId', 'messageId', 'userId', 'content', 'sender', 'timestamp'))
+REQUIRED_METRIC_FIELDS = frozenset(('angerLevel', 'trustLevel', 'progressLevel'))
+VALID_SENDERS = frozenset(('user', 'ai'))
+METRIC_VALUE_TYPES = (int, float, Decimal)
+
+# メッセージのデフォルト有効期限（秒）
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+# レスポンスに含めるメッセージのフィールド
+RESPONSE_MESSAGE_FIELDS = ('sessionId', 'messageId', 'userId', 'content', 'sender', 'timestamp', 'realtimeMetrics')
 
-# DynamoDB クライアント
-dynamodb = boto3.resource('dynamodb')
+# DynamoDB クライアント（ウォームインスタンスで接続を再利用するためkeep-aliveを有効化）
+BOTO_CONFIG = Config(max_pool_connections=50, tcp_keepalive=True)
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+dynamodb_client = boto3.client('dynamodb', config=BOTO_CONFIG)
 sessions_table = None
 messages_table = None
 scenarios_table = None
+session_feedback_table = None
 
 def init_tables():
     """
     DynamoDBテーブルのリソースを初期化
     """
-    global sessions_table, messages_table, scenarios_table
+    global sessions_table, messages_table, scenarios_table, session_feedback_table
     
     if SESSIONS_TABLE:
         sessions_table = dynamodb.Table(SESSIONS_TABLE)
@@ -38,6 +61,73 @@ def init_tables():
         
     if SCENARIOS_TABLE:
         scenarios_table = dynamodb.Table(SCENARIOS_TABLE)
+    
+    if SESSION_FEEDBACK_TABLE:
+        session_feedback_table = dynamodb.Table(SESSION_FEEDBACK_TABLE)
+
+class JsonNumberDeserializer(TypeDeserializer):
+    """
+    数値(N)をDecimalではなくint/floatに直接変換するデシリアライザ
+
+    低レベルクライアントのレスポンスをそのままJSONシリアライズ可能な形式に変換できるため、
+    Decimalへの変換とconvert_decimal_to_json_serializableによる再走査が不要になる。
+    """
+
+    def _deserialize_n(self, value):
+        if '.' in value or 'e' in value or 'E' in value:
+            return float(value)
+        return int(value)
+
+
+item_deserializer = JsonNumberDeserializer()
+
+def deserialize_item(item: dict) -> dict:
+    """
+    低レベルクライアントで取得したDynamoDBアイテムをPythonのdictに変換する
+
+    Args:
+        item: 型記述子付きのDynamoDBアイテム
+
+    Returns:
+        dict: 数値がint/floatに変換されたアイテム
+    """
+    return {key: item_deserializer.deserialize(value) for key, value in item.items()}
+
+def orjson_default(obj):
+    """
+    orjsonが直接扱えない型（DynamoDBのDecimalやSS/NS型のsetなど）を変換する
+
+    Args:
+        obj: 変換対象のオブジェクト
+
+    Returns:
+        JSONシリアライズ可能な値
+
+    Raises:
+        TypeError: 変換できない型の場合（reprを文字列として出力しないよう明示的に失敗させる）
+    """
+    if isinstance(obj, Decimal):
+        return decimal_to_number(obj)
+    if isinstance(obj, (set, frozenset)):
+        # set内のDecimalはorjsonが再度このハンドラーで変換する
+        return list(obj)
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def serialize_response(obj) -> str:
+    """
+    APIレスポンスをorjsonでJSON文字列にシリアライズする
+
+    Decimalはdefaultハンドラーで変換されるため、事前にレスポンス全体を走査する必要はない。
+
+    Args:
+        obj: レスポンスボディ
+
+    Returns:
+        str: JSON文字列
+    """
+    return orjson.dumps(obj, default=orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
 
 def get_user_id_from_event(app: APIGatewayRestResolver):
     """
@@ -59,48 +149,6 @@ def get_user_id_from_event(app: APIGatewayRestResolver):
         logger.warning("ユーザーID取得失敗、匿名ユーザーとして処理します")
         return "anonymous"
 
-def convert_decimal_to_json_serializable(obj):
-    """
-    DynamoDBのDecimal型をJSONシリアライズ可能な形式に変換する
-    
-    Args:
-        obj: 変換対象のオブジェクト
-        
-    Returns:
-        JSONシリアライズ可能なオブジェクト
-    """
-    if isinstance(obj, Decimal):
-        # Decimalを適切な数値型に変換
-        if obj % 1 == 0:
-            return int(obj)
-        else:
-            return float(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_decimal_to_json_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_decimal_to_json_serializable(item) for item in obj]
-    else:
-        return obj
-
-def convert_float_to_decimal(obj):
-    """
-    Float型をDynamoDB互換のDecimal型に変換する
-    
-    Args:
-        obj: 変換対象のオブジェクト
-        
-    Returns:
-        DynamoDB互換なオブジェクト
-    """
-    if isinstance(obj, float):
-        return Decimal(str(obj))
-    elif isinstance(obj, dict):
-        return {key: convert_float_to_decimal(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_float_to_decimal(item) for item in obj]
-    else:
-        return obj
-
 def create_message_item(session_id: str, user_id: str, message_id: str, content: str, 
                        sender: str, timestamp: int, expire_at: int, 
                        realtime_metrics: dict = None) -> dict:
@@ -114,7 +162,7 @@ def create_message_item(session_id: str, user_id: str, message_id: str, content:
         content: メッセージ内容
         sender: 送信者（user/ai）
         timestamp: タイムスタンプ
-        expire_at: 有効期限
+        expire_at: 有効期限（calculate_ttlで計算済みのUnix timestamp。複数件作成する場合は一度計算した値を使い回す）
         realtime_metrics: リアルタイム評価指標
         
     Returns:
@@ -146,32 +194,30 @@ def validate_message_data(data: dict) -> bool:
     Returns:
         bool: 妥当性の結果
     """
-    required_fields = ['sessionId', 'messageId', 'userId', 'content', 'sender', 'timestamp']
-    
     # 必須フィールドの存在確認
-    for field in required_fields:
-        if field not in data:
-            logger.error(f"必須フィールドが不足しています: {field}")
-            return False
+    missing_fields = REQUIRED_MESSAGE_FIELDS - data.keys()
+    if missing_fields:
+        logger.error(f"必須フィールドが不足しています: {', '.join(sorted(missing_fields))}")
+        return False
     
     # senderの値確認
-    if data['sender'] not in ['user', 'ai']:
+    if data['sender'] not in VALID_SENDERS:
         logger.error(f"不正なsender値: {data['sender']}")
         return False
     
     # realtimeMetricsの構造確認（存在する場合）
     if 'realtimeMetrics' in data:
         metrics = data['realtimeMetrics']
-        required_metrics = ['angerLevel', 'trustLevel', 'progressLevel']
         
-        for metric in required_metrics:
-            if metric not in metrics:
-                logger.error(f"必須メトリクスが不足しています: {metric}")
-                return False
-            
+        missing_metrics = REQUIRED_METRIC_FIELDS - metrics.keys()
+        if missing_metrics:
+            logger.error(f"必須メトリクスが不足しています: {', '.join(sorted(missing_metrics))}")
+            return False
+        
+        for metric in REQUIRED_METRIC_FIELDS:
             # メトリクス値の範囲確認（0-100）
             value = metrics[metric]
-            if not isinstance(value, (int, float, Decimal)) or value < 0 or value > 100:
+            if not isinstance(value, METRIC_VALUE_TYPES) or value < 0 or value > 100:
                 logger.error(f"メトリクス値が範囲外です: {metric}={value}")
                 return False
     
@@ -187,35 +233,29 @@ def format_message_for_response(message_item: dict) -> dict:
     Returns:
         dict: レスポンス用にフォーマットされたメッセージ
     """
-    # Decimal型をJSONシリアライズ可能な形式に変換
-    formatted_item = convert_decimal_to_json_serializable(message_item)
-    
-    # 不要なフィールドを除外（必要に応じて）
-    response_item = {
-        'sessionId': formatted_item.get('sessionId'),
-        'messageId': formatted_item.get('messageId'),
-        'userId': formatted_item.get('userId'),
-        'content': formatted_item.get('content'),
-        'sender': formatted_item.get('sender'),
-        'timestamp': formatted_item.get('timestamp'),
-        'realtimeMetrics': formatted_item.get('realtimeMetrics')
-    }
+    # 必要なフィールドのみを1回の走査で取り出し、Noneの除外とDecimal型の変換を同時に行う
+    response_item = {}
+    for field in RESPONSE_MESSAGE_FIELDS:
+        value = message_item.get(field)
+        if value is None:
+            continue
+        if isinstance(value, (Decimal, dict, list)):
+            value = convert_decimal_to_json_serializable(value)
+        response_item[field] = value
     
-    # Noneの値を除外
-    return {k: v for k, v in response_item.items() if v is not None}
+    return response_item
 
-def calculate_ttl(hours: int = 24) -> int:
+def calculate_ttl(ttl_seconds: int = DEFAULT_TTL_SECONDS) -> int:
     """
     TTL（Time To Live）を計算する
     
     Args:
-        hours: 有効期限（時間）
+        ttl_seconds: 有効期限（秒）
         
     Returns:
         int: Unix timestamp
     """
-    import time
-    return int(time.time()) + (hours * 3600)
+    return int(time.time()) + ttl_seconds
 
 # テーブルの初期化
 init_tables()
\ No newline at end of file
@@ -15,7 +15,7 @@ import boto3
 from botocore.config import Config
 from typing import Dict, Any
 from aws_lambda_powertools import Logger
-from aws_lambda_powertools.event_handler import APIGatewayRestResolver, CORSConfig
+from aws_lambda_powertools.event_handler import APIGatewayRestResolver, CORSConfig, Response
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
@@ -24,6 +24,14 @@ VIDEO_BUCKET = os.environ.get('VIDEO_BUCKET', '')
 MAX_VIDEO_SIZE_MB = int(os.environ.get('MAX_VIDEO_SIZE_MB', '100'))  # デフォルト最大100MB
 DEFAULT_PRESIGNED_URL_EXPIRY = int(os.environ.get('DEFAULT_PRESIGNED_URL_EXPIRY', '600'))  # デフォルト10分
 
+# 署名付きPOSTのフィールドと条件（リクエストごとに変わるのはキーのみのため、初期化時に一度だけ組み立てる）
+SUPPORTED_VIDEO_CONTENT_TYPE = 'video/mp4'
+UPLOAD_POST_FIELDS = {'Content-Type': SUPPORTED_VIDEO_CONTENT_TYPE}
+UPLOAD_POST_CONDITIONS = [
+    ['content-length-range', 1, MAX_VIDEO_SIZE_MB * 1024 * 1024],  # 100MB制限
+    {'Content-Type': SUPPORTED_VIDEO_CONTENT_TYPE}
+]
+
 # CORS設定
 cors_config = CORSConfig(
     allow_origin="*",
@@ -45,7 +53,9 @@ if VIDEO_BUCKET:
         config=Config(
             signature_version='s3v4',  # 署名バージョンv4を明示指定
             s3={'addressing_style': 'virtual'},  # virtual-hosted-style URLを使用
-            retries={'max_attempts': 3}  # リトライ設定
+            retries={'max_attempts': 3},  # リトライ設定
+            max_pool_connections=50,  # ウォームインスタンスで接続を再利用
+            tcp_keepalive=True  # アイドル接続の切断を防ぐ
         )
     )
     logger.info(f"S3クライアント初期化完了（動画用）: region={os.environ.get('AWS_REGION')}")
@@ -60,6 +70,27 @@ class BadRequestError(Exception):
 class InternalServerError(Exception):
     pass
 
+def error_response(status_code: int, message: str) -> Response:
+    """エラーレスポンスを作成"""
+    return Response(status_code=status_code, content_type="application/json",
+                    body=json.dumps({"error": message}))
+
+# 例外ハンドラー（初期化時に一度だけ登録し、各エンドポイントでのtry/exceptを不要にする）
+@app.exception_handler(BadRequestError)
+def handle_bad_request(e: BadRequestError) -> Response:
+    logger.warning("Bad request", extra={"error": str(e)})
+    return error_response(400, str(e))
+
+@app.exception_handler(InternalServerError)
+def handle_internal_server_error(e: InternalServerError) -> Response:
+    logger.error("Internal server error", extra={"error": str(e)})
+    return error_response(500, "Internal server error")
+
+@app.exception_handler(Exception)
+def handle_unexpected_error(e: Exception) -> Response:
+    logger.exception("Unhandled error", extra={"error": str(e)})
+    return error_response(500, "Internal server error")
+
 # S3アップロード用の署名付きURL生成
 @app.get("/videos/upload-url")
 def generate_upload_url():
@@ -75,66 +106,53 @@ def generate_upload_url():
     - uploadUrl: アップロード用の署名付きURL
     - videoKey: S3バケット内のオブジェクトキー
     """
+    # リクエストパラメータの取得
+    session_id = app.current_event.get_query_string_value(name="sessionId", default_value=None)
+    content_type = app.current_event.get_query_string_value(name="contentType", default_value=None)
+    file_name = app.current_event.get_query_string_value(name="fileName", default_value="recording.mp4")
+    
+    if not session_id:
+        raise BadRequestError("sessionId is required")
+    
+    if not content_type:
+        raise BadRequestError("contentType is required")
+    
+    if content_type != SUPPORTED_VIDEO_CONTENT_TYPE:
+        raise BadRequestError("Only video/mp4 format is supported")
+    
+    # S3オブジェクトキーの生成
+    timestamp = int(time.time())
+    video_key = f"videos/{session_id}/{timestamp}_{file_name}"
+    
+    # S3署名付きPOSTフォーム作成（CORS回避のため）
+    if not VIDEO_BUCKET:
+        raise InternalServerError("VIDEO_BUCKET environment variable is not set")
+    
+    logger.debug("署名付きURL生成開始（動画用）", extra={"bucket": VIDEO_BUCKET, "key": video_key})
+    
+    # generate_presigned_postを使用してCORSプリフライトリクエストを回避
+    # （botocoreはFields/Conditionsをコピーしてから使用するため、共有の定数をそのまま渡せる）
     try:
-        # リクエストパラメータの取得
-        session_id = app.current_event.get_query_string_value(name="sessionId", default_value=None)
-        content_type = app.current_event.get_query_string_value(name="contentType", default_value=None)
-        file_name = app.current_event.get_query_string_value(name="fileName", default_value="recording.mp4")
-        
-        if not session_id:
-            raise BadRequestError("sessionId is required")
-        
-        if not content_type:
-            raise BadRequestError("contentType is required")
-        
-        if content_type != 'video/mp4':
-            raise BadRequestError("Only video/mp4 format is supported")
-        
-        # S3オブジェクトキーの生成
-        timestamp = int(time.time())
-        video_key = f"videos/{session_id}/{timestamp}_{file_name}"
-        
-        # S3署名付きPOSTフォーム作成（CORS回避のため）
-        if not VIDEO_BUCKET:
-            raise InternalServerError("VIDEO_BUCKET environment variable is not set")
-        
-        logger.info(f"署名付きURL生成開始（動画用）: bucket={VIDEO_BUCKET}, key={video_key}, contentType={content_type}, region={os.environ.get('AWS_REGION')}")
-        
-        # generate_presigned_postを使用してCORSプリフライトリクエストを回避
         post_data = s3.generate_presigned_post(
             Bucket=VIDEO_BUCKET,
             Key=video_key,
-            Fields={'Content-Type': content_type},
-            Conditions=[
-                ['content-length-range', 1, MAX_VIDEO_SIZE_MB * 1024 * 1024],  # 100MB制限
-                {'Content-Type': content_type}
-            ],
+            Fields=UPLOAD_POST_FIELDS,
+            Conditions=UPLOAD_POST_CONDITIONS,
             ExpiresIn=DEFAULT_PRESIGNED_URL_EXPIRY
         )
-        
-        logger.info(f"署名付きPOST URL生成成功（動画用）: bucket={VIDEO_BUCKET}, key={video_key}")
-        logger.info(f"生成されたURL（動画用）: {post_data['url']}")
-        logger.info(f"フォームデータのフィールド数（動画用）: {len(post_data['fields'])}")
-        logger.info(f"フォームデータの内容（動画用）: {json.dumps(post_data['fields'], default=str)}")
-        
-        return {
-            "uploadUrl": post_data["url"],
-            "formData": post_data["fields"],
-            "videoKey": video_key,
-            "expiresIn": DEFAULT_PRESIGNED_URL_EXPIRY
-        }
-        
-    except BadRequestError as e:
-        logger.warn(f"Bad request: {str(e)}")
-        return {"error": str(e)}, 400
+    except Exception as e:
+        logger.error("Error generating presigned URL", extra={"error": str(e), "key": video_key})
+        return error_response(500, "Failed to generate upload URL")
     
-    except InternalServerError as e:
-        logger.error(f"Internal server error: {str(e)}")
-        return {"error": "Internal server error"}, 500
+    # フォームデータには署名やポリシーが含まれるためログには出力しない
+    logger.info("署名付きPOST URL生成成功（動画用）", extra={"bucket": VIDEO_BUCKET, "key": video_key})
     
-    except Exception as e:
-        logger.error(f"Error generating presigned URL: {str(e)}")
-        return {"error": "Failed to generate upload URL"}, 500
+    return {
+        "uploadUrl": post_data["url"],
+        "formData": post_data["fields"],
+        "videoKey": video_key,
+        "expiresIn": DEFAULT_PRESIGNED_URL_EXPIRY
+    }
 
 # Lambda handler
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
@@ -95,6 +95,15 @@ export class ScoringLambdaConstruct extends Construct {
       })
     );
 
+    // 初期化時のDynamoDB接続の事前確立に使用（DescribeEndpointsはリソース指定不可）
+    lambdaExecutionRole.addToPolicy(
+      new iam.PolicyStatement({
+        effect: iam.Effect.ALLOW,
+        actions: ['dynamodb:DescribeEndpoints'],
+        resources: ['*'],
+      })
+    );
+
     // Guardrailsデータを読み込む
     const guardrailsFilePath = path.join(path.dirname(path.dirname(path.dirname(__dirname))), 'data', 'guardrails.json');
     const guardrailsData = JSON.parse(fs.readFileSync(guardrailsFilePath, 'utf8'));
@@ -142,11 +151,26 @@ export class ScoringLambdaConstruct extends Construct {
         ENVIRONMENT_PREFIX: props.environmentPrefix,
         SESSION_FEEDBACK_TABLE: props.sessionFeedbackTable.tableName,
         SCENARIOS_TABLE_NAME: props.scenariosTable.tableName,
+        // スコアリング時にそのまま渡す直近の会話メッセージ数
+        SCORING_HISTORY_WINDOW: "12",
         // Guardrail関連の環境変数を追加
         ...guardrailsEnvVars
       },
     });
 
+    // 会話履歴の要約を自身の非同期呼び出しで生成するための権限
+    // （実行ロールのデフォルトポリシーに追加すると関数との循環参照になるため、別のポリシーとして作成）
+    new iam.Policy(this, 'SelfInvokePolicy', {
+      roles: [lambdaExecutionRole],
+      statements: [
+        new iam.PolicyStatement({
+          effect: iam.Effect.ALLOW,
+          actions: ['lambda:InvokeFunction'],
+          resources: [this.function.functionArn],
+        }),
+      ],
+    });
+
     props.sessionFeedbackTable.grantReadWriteData(this.function)
     props.scenariosTable.grantReadData(this.function)
   }
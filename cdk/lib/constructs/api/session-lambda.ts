@@ -128,17 +128,26 @@ export class SessionLambdaConstruct extends Construct {
     );
 
     // インデックスへのアクセス権限も付与
+    const dynamodbIndexResources = [
+      `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${props.scenariosTableName}/index/CategoryIndex`,
+      `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${props.sessionsTableName}/index/CreatedAtIndex`,
+      `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${props.sessionsTableName}/index/ScenarioSessionsIndex`,
+      `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${props.sessionsTableName}/index/SessionIdIndex`,
+    ];
+
+    if (props.sessionFeedbackTableName) {
+      dynamodbIndexResources.push(
+        `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${props.sessionFeedbackTableName}/index/sessionId-dataType-index`
+      );
+    }
+
     this.function.addToRolePolicy(
       new iam.PolicyStatement({
         effect: iam.Effect.ALLOW,
         actions: [
           'dynamodb:Query',
         ],
-        resources: [
-          `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${props.scenariosTableName}/index/CategoryIndex`,
-          `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${props.sessionsTableName}/index/CreatedAtIndex`,
-          `arn:aws:dynamodb:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:table/${props.sessionsTableName}/index/ScenarioSessionsIndex`,
-        ],
+        resources: dynamodbIndexResources,
       })
     );
 
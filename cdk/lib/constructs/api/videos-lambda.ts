@@ -105,16 +105,5 @@ export class VideosLambdaConstruct extends Construct {
         ]
       })
     );
-
-    // STS（アカウントID取得用）へのアクセス許可
-    lambdaExecutionRole.addToPolicy(
-      new iam.PolicyStatement({
-        effect: iam.Effect.ALLOW,
-        actions: [
-          'sts:GetCallerIdentity',
-        ],
-        resources: ['*']
-      })
-    );
   }
 }
\ No newline at end of file
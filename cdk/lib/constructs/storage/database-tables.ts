@@ -68,6 +68,17 @@ export class DatabaseTables extends Construct {
       projectionType: dynamodb.ProjectionType.ALL
     });
 
+    // ユーザーIDが分からない場合にセッションIDから検索するためのGSIを追加
+    this.sessionsTable.addGlobalSecondaryIndex({
+      indexName: 'SessionIdIndex',
+      partitionKey: {
+        name: 'sessionId',
+        type: dynamodb.AttributeType.STRING
+      },
+      projectionType: dynamodb.ProjectionType.INCLUDE,
+      nonKeyAttributes: ['scenarioId']
+    });
+
     // メッセージテーブル
     this.messagesTable = new dynamodb.Table(this, 'MessagesTable', {
       tableName: `${prefix}AISalesRolePlay-Messages`,
@@ -114,5 +125,19 @@ export class DatabaseTables extends Construct {
       projectionType: dynamodb.ProjectionType.INCLUDE,
       nonKeyAttributes: ['userId', 'sessionId', 'feedbackData', 'createdAt', 'dataType', 'timestamp', 'updatedAt']
     });
+
+    // セッション内のデータタイプ別取得用のGSIを追加
+    this.sessionFeedbackTable.addGlobalSecondaryIndex({
+      indexName: 'sessionId-dataType-index',
+      partitionKey: {
+        name: 'sessionId',
+        type: dynamodb.AttributeType.STRING
+      },
+      sortKey: {
+        name: 'dataType',
+        type: dynamodb.AttributeType.STRING
+      },
+      projectionType: dynamodb.ProjectionType.ALL
+    });
   }
 }